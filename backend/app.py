@@ -1,24 +1,32 @@
 """FastAPI backend — msgpack endpoints for integration and visualization."""
 
+import asyncio
+import contextvars
+import hashlib
 import os
 import sys
 import logging
+import logging.handlers
 import math
+import queue
 import time
-import traceback
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any
 
-import msgpack
-import torch
+import msgspec
+import numpy as np
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sympy import latex, N, lambdify
+from fastapi.middleware.gzip import GZipMiddleware
+from sympy import latex, simplify, N
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.config import Config
-from backend.parsers import safe_parse, parse_vector_field, x, y, z, t, u, v, SCALAR_MODULES, TORCH_MODULES
+from backend.parsers import safe_parse, parse_vector_field, parse_bounds, lambdify_cached, x, y, z, t, u, v
 from backend.integrators import (
     compute_integral_1d,
     compute_integral_2d,
@@ -46,12 +54,24 @@ from backend.theorems import (
     verify_divergence_theorem,
 )
 from backend.examples import get_examples
-
-# Configure logging
+from backend.serialization import pack_f32 as _pack_f32
+from backend.stream import trace_field_lines
+
+# Configure logging. Handlers only enqueue records; a QueueListener started
+# at app boot does the actual formatting and stderr writes on a background
+# thread, keeping log I/O out of the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(
+    '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S',
+))
 logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL),
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _log_stream_handler, respect_handler_level=True
 )
 logger = logging.getLogger(__name__)
 
@@ -65,55 +85,305 @@ app = FastAPI(
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=Config.CORS_ORIGINS.split(',') if Config.CORS_ORIGINS != '*' else ['*'],
+    allow_origins=list(Config.CORS_ORIGINS_LIST),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Simple in-memory rate limiter
-_rate_limit_store: dict[str, list[float]] = defaultdict(list)
+# Mesh-heavy visualization payloads compress well; level 4 trades a little
+# ratio for much less CPU than the default 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
+# Simple in-memory rate limiter: per-IP deque of request timestamps
+RATE_LIMIT_WINDOW = 60  # seconds
+RATE_LIMIT = Config.RATE_LIMIT_PER_MINUTE  # bound once; read per request
+RATE_LIMIT_MAX_IPS = 100_000  # sweep stale entries once this many IPs are tracked
+_rate_limit_store: dict[str, deque[float]] = defaultdict(
+    lambda: deque(maxlen=RATE_LIMIT)
+)
 
 MSGPACK_CONTENT_TYPE = 'application/x-msgpack'
 
+@lru_cache(maxsize=128)
+def _compile_vf(vf: tuple):
+    """Compile all three components of a vector field as scalar callables.
+
+    Cached on the expr tuple so repeated requests with the same field reuse
+    one compilation across handlers.
+    """
+    return tuple(lambdify_cached(comp, (x, y, z), 'scalar', jit=True) for comp in vf)
+
+
+# SymPy exprs are immutable and hashable, so repeated requests for the same
+# expression skip these expensive calls entirely
+_simplify = lru_cache(maxsize=1024)(simplify)
+_latex = lru_cache(maxsize=1024)(latex)
+
+# Reusable msgspec codecs (much faster than per-call packb/unpackb)
+_ENC = msgspec.msgpack.Encoder()
+_DEC = msgspec.msgpack.Decoder()
+_JSON_ENC = msgspec.json.Encoder()
+_JSON_DEC = msgspec.json.Decoder()
+
+# Set per request by msgpack_route when the client asks for JSON responses
+_wants_json: contextvars.ContextVar[bool] = contextvars.ContextVar('wants_json', default=False)
+
+
+# Typed request shapes. Decoding straight into slotted structs is faster than
+# building dicts, validates types in the same pass, and replaces per-key
+# .get() dispatch with attribute access. Unknown fields are ignored, so older
+# clients keep working.
+class ParseReq(msgspec.Struct):
+    expression: str = ''
+
+
+class Integrate1DReq(msgspec.Struct):
+    integrand: str = 'x'
+    lower_bound: Any = 0
+    upper_bound: Any = 1
+    include_steps: bool = False
+    symbolic: bool = True
+
+
+class Integrate2DReq(msgspec.Struct):
+    integrand: str = '1'
+    region: dict = msgspec.field(default_factory=lambda: {
+        'type': 'rectangle', 'x_min': 0, 'x_max': 1, 'y_min': 0, 'y_max': 1,
+    })
+    symbolic: bool = True
+
+
+class Integrate3DReq(msgspec.Struct):
+    integrand: str = '1'
+    region: dict = msgspec.field(default_factory=lambda: {
+        'type': 'box', 'x_min': 0, 'x_max': 1, 'y_min': 0, 'y_max': 1,
+        'z_min': 0, 'z_max': 1,
+    })
+    symbolic: bool = True
+
+
+class LineScalarReq(msgspec.Struct):
+    integrand: str = '1'
+    curve: dict = msgspec.field(default_factory=lambda: {'x': 't', 'y': '0', 'z': '0'})
+    t_start: Any = 0
+    t_end: Any = 1
+
+
+class LineVectorReq(msgspec.Struct):
+    vector_field: dict = msgspec.field(default_factory=lambda: {'x': '1', 'y': '0', 'z': '0'})
+    curve: dict = msgspec.field(default_factory=lambda: {'x': 't', 'y': '0', 'z': '0'})
+    t_start: Any = 0
+    t_end: Any = 1
+
+
+class SurfaceScalarReq(msgspec.Struct):
+    integrand: str = '1'
+    surface: dict = msgspec.field(default_factory=lambda: {'x': 'u', 'y': 'v', 'z': '0'})
+    u_range: list = msgspec.field(default_factory=lambda: [0, 1])
+    v_range: list = msgspec.field(default_factory=lambda: [0, 1])
+
+
+class FluxReq(msgspec.Struct):
+    vector_field: dict = msgspec.field(default_factory=lambda: {'x': '0', 'y': '0', 'z': '1'})
+    surface: dict = msgspec.field(default_factory=lambda: {'x': 'u', 'y': 'v', 'z': '0'})
+    u_range: list = msgspec.field(default_factory=lambda: [0, 1])
+    v_range: list = msgspec.field(default_factory=lambda: [0, 1])
+
+
+class VectorOpsReq(msgspec.Struct):
+    operation: str = 'divergence'
+    scalar_field: str = 'x^2 + y^2 + z^2'
+    vector_field: dict | None = None
+
+
+class VisualizeFieldReq(msgspec.Struct):
+    vector_field: dict = msgspec.field(default_factory=lambda: {'x': '-y', 'y': 'x', 'z': '0'})
+    region: dict = msgspec.field(default_factory=lambda: {
+        'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2, 'z_min': -2, 'z_max': 2,
+    })
+
+
+class FieldLinesReq(msgspec.Struct):
+    vector_field: dict = msgspec.field(default_factory=lambda: {'x': 'x', 'y': 'y', 'z': '0'})
+    start_points: list | None = None
+    region: dict = msgspec.field(default_factory=lambda: {
+        'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2, 'z_min': -1, 'z_max': 1,
+    })
+    num_lines: int = 20
+    steps: int = 100
+    step_size: float = 0.05
+
+
+class EquipotentialReq(msgspec.Struct):
+    scalar_field: str = 'x^2 + y^2'
+    region: dict = msgspec.field(default_factory=lambda: {
+        'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2,
+    })
+    num_levels: int = 10
+    resolution: int = 50
+
+
+class ExportLatexReq(msgspec.Struct):
+    integrand: str = 'x^2'
+    integral_type: str = '1d'
+    result: dict = msgspec.field(default_factory=dict)
+    lower_bound: Any = '0'
+    upper_bound: Any = '1'
+
+
+# Static payloads: encode once at import and serve 304s against an ETag
+HEALTH_BLOB = _ENC.encode({
+    'status': 'healthy',
+    'message': 'Integration Visualizer API is running',
+    'version': '2.0.0',
+})
+HEALTH_ETAG = hashlib.blake2b(HEALTH_BLOB, digest_size=8).hexdigest()
+EXAMPLES_BLOB = _ENC.encode(get_examples())
+EXAMPLES_ETAG = hashlib.blake2b(EXAMPLES_BLOB, digest_size=8).hexdigest()
+
+
+def _static_msgpack(request: Request, blob: bytes, etag: str, max_age: int) -> Response:
+    """Serve a pre-encoded payload, answering 304 on an ETag match."""
+    headers = {'ETag': etag, 'Cache-Control': f'public, max-age={max_age}'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=blob, media_type=MSGPACK_CONTENT_TYPE, headers=headers)
+
+
+class MsgpackResponse(Response):
+    """Response rendered through the shared msgspec msgpack encoder."""
+
+    media_type = MSGPACK_CONTENT_TYPE
+
+    def render(self, content) -> bytes:
+        return _ENC.encode(content)
+
+
+class MsgspecJSONResponse(Response):
+    """JSON response rendered through the shared msgspec encoder."""
+
+    media_type = 'application/json'
+
+    def render(self, content) -> bytes:
+        return _JSON_ENC.encode(content)
+
 
 def msgpack_response(data: dict, status_code: int = 200) -> Response:
-    """Pack data as msgpack response."""
-    return Response(
-        content=msgpack.packb(data, use_bin_type=True),
-        media_type=MSGPACK_CONTENT_TYPE,
-        status_code=status_code,
-    )
+    """Pack data as msgpack (or JSON, when the client asked for it)."""
+    if _wants_json.get():
+        return MsgspecJSONResponse(data, status_code=status_code)
+    return MsgpackResponse(data, status_code=status_code)
 
 
-async def parse_msgpack_body(request: Request) -> dict:
-    """Decode msgpack body, fall back to JSON."""
-    content_type = request.headers.get('content-type', '')
-    body = await request.body()
-    if MSGPACK_CONTENT_TYPE in content_type:
-        return msgpack.unpackb(body, raw=False)
-    else:
-        import json
-        return json.loads(body)
+def _sweep_stale_rate_limit_entries(now: float) -> None:
+    """Drop entries whose last request fell out of the window."""
+    stale = [
+        ip for ip, dq in _rate_limit_store.items()
+        if not dq or now - dq[-1] >= RATE_LIMIT_WINDOW
+    ]
+    for ip in stale:
+        del _rate_limit_store[ip]
 
 
 def check_rate_limit(request: Request) -> bool:
     """True if under rate limit."""
     ip = request.client.host if request.client else 'unknown'
-    now = time.time()
-    window = 60
+    now = time.monotonic()
 
-    _rate_limit_store[ip] = [
-        ts for ts in _rate_limit_store[ip] if now - ts < window
-    ]
+    # Hard cap on tracked IPs so a spoofed-address flood can't grow the
+    # store without bound between background eviction runs
+    if ip not in _rate_limit_store and len(_rate_limit_store) >= RATE_LIMIT_MAX_IPS:
+        _sweep_stale_rate_limit_entries(now)
 
-    if len(_rate_limit_store[ip]) >= Config.RATE_LIMIT_PER_MINUTE:
+    dq = _rate_limit_store[ip]
+    while dq and now - dq[0] >= RATE_LIMIT_WINDOW:
+        dq.popleft()
+
+    if len(dq) >= RATE_LIMIT:
         return False
 
-    _rate_limit_store[ip].append(now)
+    dq.append(now)
     return True
 
 
+def msgpack_route(struct=None):
+    """Wrap a POST handler with the shared rate-limit / decode / error plumbing.
+
+    The wrapped handler receives the decoded request body — a typed struct
+    when ``struct`` is given, a plain dict otherwise — and only has to return
+    a msgpack response; rate-limit rejections become 429s and any exception
+    (including decode/validation errors) becomes a 400 with the error message.
+    """
+    if struct is None:
+        dec, json_dec = _DEC, _JSON_DEC
+    else:
+        dec, json_dec = msgspec.msgpack.Decoder(struct), msgspec.json.Decoder(struct)
+
+    def decorate(handler):
+        async def wrapper(request: Request) -> Response:
+            if not check_rate_limit(request):
+                return msgpack_response({
+                    'success': False,
+                    'error': 'Rate limit exceeded. Please wait before making more requests.',
+                }, 429)
+            _wants_json.set('application/json' in request.headers.get('accept', ''))
+            try:
+                body = await request.body()
+                if MSGPACK_CONTENT_TYPE in request.headers.get('content-type', ''):
+                    data = dec.decode(body)
+                else:
+                    data = json_dec.decode(body)
+                return await handler(data)
+            except Exception as e:
+                if Config.DEBUG:
+                    logger.exception(f"{handler.__name__} failed")
+                return msgpack_response({'success': False, 'error': str(e)}, 400)
+        # Keep the handler's name for route naming, but let FastAPI see the
+        # wrapper's (request) signature rather than the handler's.
+        wrapper.__name__ = handler.__name__
+        return wrapper
+    return decorate
+
+
+async def _evict_idle_rate_limit_entries():
+    """Periodically drop deques for IPs that have gone quiet."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_WINDOW)
+        _sweep_stale_rate_limit_entries(time.monotonic())
+
+
+async def _run(fn, *args):
+    """Run a CPU-bound sympy computation on the worker pool.
+
+    SymPy work blocks the event loop for hundreds of ms and holds the GIL,
+    so heavy handlers farm it out to worker processes. Everything crossing
+    the boundary (exprs, region dicts, result dicts) is picklable. With
+    POOL_WORKERS=0 the call runs inline.
+    """
+    executor = getattr(app.state, 'executor', None)
+    if executor is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+@app.on_event('startup')
+async def _startup():
+    _log_listener.start()
+    app.state.rate_limit_evictor = asyncio.create_task(_evict_idle_rate_limit_entries())
+    app.state.executor = (
+        ProcessPoolExecutor(max_workers=Config.POOL_WORKERS) if Config.POOL_WORKERS else None
+    )
+
+
+@app.on_event('shutdown')
+async def _shutdown():
+    app.state.rate_limit_evictor.cancel()
+    if app.state.executor is not None:
+        app.state.executor.shutdown(cancel_futures=True)
+    _log_listener.stop()
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
@@ -125,469 +395,319 @@ async def log_requests(request: Request, call_next):
 
 
 @app.get('/api/health')
-async def health_check():
-    return msgpack_response({
-        'status': 'healthy',
-        'message': 'Integration Visualizer API is running',
-        'version': '2.0.0',
-    })
+async def health_check(request: Request):
+    return _static_msgpack(request, HEALTH_BLOB, HEALTH_ETAG, max_age=60)
 
 
 @app.post('/api/parse')
-async def parse_expression(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        from sympy import simplify
-        expr = safe_parse(data.get('expression', ''))
-        return msgpack_response({
-            'success': True, 'parsed': str(expr), 'latex': latex(expr),
-            'simplified': str(simplify(expr)), 'simplified_latex': latex(simplify(expr)),
-        })
-    except Exception as e:
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(ParseReq)
+async def parse_expression(req: ParseReq):
+    expr = safe_parse(req.expression)
+    simplified = _simplify(expr)
+    return msgpack_response({
+        'success': True, 'parsed': str(expr), 'latex': _latex(expr),
+        'simplified': str(simplified), 'simplified_latex': _latex(simplified),
+    })
 
 
 @app.post('/api/integrate/1d')
-async def integrate_1d(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        a = safe_parse(str(data.get('lower_bound', 0)))
-        b = safe_parse(str(data.get('upper_bound', 1)))
-        integrand_expr = safe_parse(data.get('integrand', 'x'))
-        result = compute_integral_1d(integrand_expr, a, b)
-        viz_data = generate_1d_visualization_data(integrand_expr, a, b)
-        response_data = {
-            'success': True, 'integrand': str(integrand_expr),
-            'integrand_latex': latex(integrand_expr),
-            'bounds': {'lower': str(a), 'upper': str(b)},
-            'result': result, 'visualization': viz_data,
-        }
-        if data.get('include_steps', False):
-            try:
-                response_data['steps'] = generate_step_by_step_1d(integrand_expr, a, b)
-            except Exception:
-                response_data['steps'] = []
-        return msgpack_response(response_data)
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(Integrate1DReq)
+async def integrate_1d(req: Integrate1DReq):
+    a = parse_bounds(req.lower_bound)
+    b = parse_bounds(req.upper_bound)
+    integrand_expr = safe_parse(req.integrand)
+    result = await _run(compute_integral_1d, integrand_expr, a, b, req.symbolic)
+    viz_data = await _run(generate_1d_visualization_data, integrand_expr, a, b)
+    # Curve samples ship as packed float32 blobs (like field lines and
+    # contours) instead of per-float msgpack elements
+    curve = viz_data.get('curve')
+    if curve:
+        viz_data['curve'] = {'x': _pack_f32(curve['x']), 'y': _pack_f32(curve['y'])}
+    response_data = {
+        'success': True, 'integrand': str(integrand_expr),
+        'integrand_latex': _latex(integrand_expr),
+        'bounds': {'lower': str(a), 'upper': str(b)},
+        'result': result, 'visualization': viz_data,
+    }
+    if req.include_steps:
+        try:
+            response_data['steps'] = await _run(generate_step_by_step_1d, integrand_expr, a, b)
+        except Exception:
+            response_data['steps'] = []
+    return msgpack_response(response_data)
 
 
 @app.post('/api/integrate/2d')
-async def integrate_2d(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        integrand_expr = safe_parse(data.get('integrand', '1'))
-        region = data.get('region', {'type': 'rectangle', 'x_min': 0, 'x_max': 1, 'y_min': 0, 'y_max': 1})
-        result = compute_integral_2d(integrand_expr, region)
-        viz_data = generate_2d_visualization_data(integrand_expr, region)
-        return msgpack_response({
-            'success': True, 'integrand': str(integrand_expr),
-            'integrand_latex': latex(integrand_expr),
-            'region': region, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(Integrate2DReq)
+async def integrate_2d(req: Integrate2DReq):
+    integrand_expr = safe_parse(req.integrand)
+    region = req.region
+    result = await _run(compute_integral_2d, integrand_expr, region, req.symbolic)
+    viz_data = await _run(generate_2d_visualization_data, integrand_expr, region)
+    return msgpack_response({
+        'success': True, 'integrand': str(integrand_expr),
+        'integrand_latex': _latex(integrand_expr),
+        'region': region, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/integrate/3d')
-async def integrate_3d(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        integrand_expr = safe_parse(data.get('integrand', '1'))
-        region = data.get('region', {'type': 'box', 'x_min': 0, 'x_max': 1, 'y_min': 0, 'y_max': 1, 'z_min': 0, 'z_max': 1})
-        result = compute_integral_3d(integrand_expr, region)
-        viz_data = generate_3d_visualization_data(integrand_expr, region)
-        return msgpack_response({
-            'success': True, 'integrand': str(integrand_expr),
-            'integrand_latex': latex(integrand_expr),
-            'region': region, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(Integrate3DReq)
+async def integrate_3d(req: Integrate3DReq):
+    integrand_expr = safe_parse(req.integrand)
+    region = req.region
+    result = await _run(compute_integral_3d, integrand_expr, region, req.symbolic)
+    viz_data = await _run(generate_3d_visualization_data, integrand_expr, region)
+    return msgpack_response({
+        'success': True, 'integrand': str(integrand_expr),
+        'integrand_latex': _latex(integrand_expr),
+        'region': region, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/integrate/line/scalar')
-async def integrate_line_scalar(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        integrand_expr = safe_parse(data.get('integrand', '1'))
-        curve = data.get('curve', {'x': 't', 'y': '0', 'z': '0'})
-        result = compute_line_integral_scalar(integrand_expr, curve, data.get('t_start', 0), data.get('t_end', 1))
-        viz_data = generate_line_integral_visualization(curve, data.get('t_start', 0), data.get('t_end', 1))
-        return msgpack_response({
-            'success': True, 'integral_type': 'line_scalar',
-            'integrand': str(integrand_expr), 'integrand_latex': latex(integrand_expr),
-            'curve': curve, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(LineScalarReq)
+async def integrate_line_scalar(req: LineScalarReq):
+    integrand_expr = safe_parse(req.integrand)
+    curve = req.curve
+    result = await _run(compute_line_integral_scalar, integrand_expr, curve, req.t_start, req.t_end)
+    viz_data = await _run(generate_line_integral_visualization, curve, req.t_start, req.t_end)
+    return msgpack_response({
+        'success': True, 'integral_type': 'line_scalar',
+        'integrand': str(integrand_expr), 'integrand_latex': _latex(integrand_expr),
+        'curve': curve, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/integrate/line/vector')
-async def integrate_line_vector(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        vf = parse_vector_field(data.get('vector_field', {'x': '1', 'y': '0', 'z': '0'}))
-        curve = data.get('curve', {'x': 't', 'y': '0', 'z': '0'})
-        result = compute_line_integral_vector(vf, curve, data.get('t_start', 0), data.get('t_end', 1))
-        viz_data = generate_line_integral_visualization(curve, data.get('t_start', 0), data.get('t_end', 1), vf)
-        return msgpack_response({
-            'success': True, 'integral_type': 'line_vector',
-            'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
-            'vector_field_latex': {k: latex(c) for k, c in zip('xyz', vf)},
-            'curve': curve, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(LineVectorReq)
+async def integrate_line_vector(req: LineVectorReq):
+    vf = parse_vector_field(req.vector_field)
+    curve = req.curve
+    result = await _run(compute_line_integral_vector, vf, curve, req.t_start, req.t_end)
+    viz_data = await _run(generate_line_integral_visualization, curve, req.t_start, req.t_end, vf)
+    return msgpack_response({
+        'success': True, 'integral_type': 'line_vector',
+        'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
+        'vector_field_latex': {k: _latex(c) for k, c in zip('xyz', vf)},
+        'curve': curve, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/integrate/surface/scalar')
-async def integrate_surface_scalar(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        integrand_expr = safe_parse(data.get('integrand', '1'))
-        surface = data.get('surface', {'x': 'u', 'y': 'v', 'z': '0'})
-        u_range, v_range = data.get('u_range', [0, 1]), data.get('v_range', [0, 1])
-        result = compute_surface_integral_scalar(integrand_expr, surface, u_range, v_range)
-        viz_data = generate_surface_integral_visualization(surface, u_range, v_range)
-        return msgpack_response({
-            'success': True, 'integral_type': 'surface_scalar',
-            'integrand': str(integrand_expr), 'integrand_latex': latex(integrand_expr),
-            'surface': surface, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(SurfaceScalarReq)
+async def integrate_surface_scalar(req: SurfaceScalarReq):
+    integrand_expr = safe_parse(req.integrand)
+    surface = req.surface
+    u_range, v_range = req.u_range, req.v_range
+    result = await _run(compute_surface_integral_scalar, integrand_expr, surface, u_range, v_range)
+    viz_data = await _run(generate_surface_integral_visualization, surface, u_range, v_range)
+    return msgpack_response({
+        'success': True, 'integral_type': 'surface_scalar',
+        'integrand': str(integrand_expr), 'integrand_latex': _latex(integrand_expr),
+        'surface': surface, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/integrate/flux')
-async def integrate_flux(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        vf = parse_vector_field(data.get('vector_field', {'x': '0', 'y': '0', 'z': '1'}))
-        surface = data.get('surface', {'x': 'u', 'y': 'v', 'z': '0'})
-        u_range, v_range = data.get('u_range', [0, 1]), data.get('v_range', [0, 1])
-        result = compute_flux_integral(vf, surface, u_range, v_range)
-        viz_data = generate_surface_integral_visualization(surface, u_range, v_range, vf)
-        return msgpack_response({
-            'success': True, 'integral_type': 'flux',
-            'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
-            'vector_field_latex': {k: latex(c) for k, c in zip('xyz', vf)},
-            'surface': surface, 'result': result, 'visualization': viz_data,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(FluxReq)
+async def integrate_flux(req: FluxReq):
+    vf = parse_vector_field(req.vector_field)
+    surface = req.surface
+    u_range, v_range = req.u_range, req.v_range
+    result = await _run(compute_flux_integral, vf, surface, u_range, v_range)
+    viz_data = await _run(generate_surface_integral_visualization, surface, u_range, v_range, vf)
+    return msgpack_response({
+        'success': True, 'integral_type': 'flux',
+        'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
+        'vector_field_latex': {k: _latex(c) for k, c in zip('xyz', vf)},
+        'surface': surface, 'result': result, 'visualization': viz_data,
+    })
 
 
 @app.post('/api/vector/operations')
-async def vector_operations(request: Request):
-    if not check_rate_limit(request):
+@msgpack_route(VectorOpsReq)
+async def vector_operations(req: VectorOpsReq):
+    operation = req.operation
+    if operation == 'gradient':
+        sf = safe_parse(req.scalar_field)
+        grad = compute_gradient_field(sf)
         return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        operation = data.get('operation', 'divergence')
-        if operation == 'gradient':
-            sf = safe_parse(data.get('scalar_field', 'x^2 + y^2 + z^2'))
-            grad = compute_gradient_field(sf)
-            return msgpack_response({
-                'success': True, 'operation': 'gradient',
-                'input': str(sf), 'input_latex': latex(sf),
-                'result': {k: str(c) for k, c in zip('xyz', grad)},
-                'result_latex': {k: latex(c) for k, c in zip('xyz', grad)},
-            })
-        elif operation == 'divergence':
-            vf = parse_vector_field(data.get('vector_field', {'x': 'x', 'y': 'y', 'z': 'z'}))
-            div = compute_divergence_field(vf)
-            return msgpack_response({
-                'success': True, 'operation': 'divergence',
-                'input': {k: str(c) for k, c in zip('xyz', vf)},
-                'result': str(div), 'result_latex': latex(div),
-            })
-        elif operation == 'curl':
-            vf = parse_vector_field(data.get('vector_field', {'x': '-y', 'y': 'x', 'z': '0'}))
-            curl = compute_curl_field(vf)
-            return msgpack_response({
-                'success': True, 'operation': 'curl',
-                'input': {k: str(c) for k, c in zip('xyz', vf)},
-                'result': {k: str(c) for k, c in zip('xyz', curl)},
-                'result_latex': {k: latex(c) for k, c in zip('xyz', curl)},
-            })
-        else:
-            return msgpack_response({'success': False, 'error': f'Unknown operation: {operation}'}, 400)
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
-
-
-@app.post('/api/visualize/vector_field')
-async def visualize_vector_field(request: Request):
-    if not check_rate_limit(request):
+            'success': True, 'operation': 'gradient',
+            'input': str(sf), 'input_latex': _latex(sf),
+            'result': {k: str(c) for k, c in zip('xyz', grad)},
+            'result_latex': {k: _latex(c) for k, c in zip('xyz', grad)},
+        })
+    elif operation == 'divergence':
+        vf = parse_vector_field(req.vector_field or {'x': 'x', 'y': 'y', 'z': 'z'})
+        div = compute_divergence_field(vf)
         return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        vf = parse_vector_field(data.get('vector_field', {'x': '-y', 'y': 'x', 'z': '0'}))
-        region = data.get('region', {'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2, 'z_min': -2, 'z_max': 2})
-        viz_data = generate_vector_field_visualization(vf, region)
+            'success': True, 'operation': 'divergence',
+            'input': {k: str(c) for k, c in zip('xyz', vf)},
+            'result': str(div), 'result_latex': _latex(div),
+        })
+    elif operation == 'curl':
+        vf = parse_vector_field(req.vector_field or {'x': '-y', 'y': 'x', 'z': '0'})
+        curl = compute_curl_field(vf)
         return msgpack_response({
-            'success': True,
-            'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
-            'visualization': viz_data,
+            'success': True, 'operation': 'curl',
+            'input': {k: str(c) for k, c in zip('xyz', vf)},
+            'result': {k: str(c) for k, c in zip('xyz', curl)},
+            'result_latex': {k: _latex(c) for k, c in zip('xyz', curl)},
         })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+    else:
+        return msgpack_response({'success': False, 'error': f'Unknown operation: {operation}'}, 400)
+
+
+@app.post('/api/visualize/vector_field')
+@msgpack_route(VisualizeFieldReq)
+async def visualize_vector_field(req: VisualizeFieldReq):
+    vf = parse_vector_field(req.vector_field)
+    region = req.region
+    viz_data = await _run(generate_vector_field_visualization, vf, region)
+    return msgpack_response({
+        'success': True,
+        'vector_field': {k: str(c) for k, c in zip('xyz', vf)},
+        'visualization': viz_data,
+    })
 
 
 @app.post('/api/theorem/greens')
-async def api_verify_greens(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        return msgpack_response({'success': True, **verify_greens_theorem(data)})
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route()
+async def api_verify_greens(data: dict):
+    return msgpack_response({'success': True, **await _run(verify_greens_theorem, data)})
 
 
 @app.post('/api/theorem/stokes')
-async def api_verify_stokes(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        return msgpack_response({'success': True, **verify_stokes_theorem(data)})
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route()
+async def api_verify_stokes(data: dict):
+    return msgpack_response({'success': True, **await _run(verify_stokes_theorem, data)})
 
 
 @app.post('/api/theorem/divergence')
-async def api_verify_divergence(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        return msgpack_response({'success': True, **verify_divergence_theorem(data)})
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route()
+async def api_verify_divergence(data: dict):
+    return msgpack_response({'success': True, **await _run(verify_divergence_theorem, data)})
 
 
 @app.post('/api/physics/field_lines')
-async def compute_field_lines(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        vf = parse_vector_field(data.get('vector_field', {'x': 'x', 'y': 'y', 'z': '0'}))
-        start_points = data.get('start_points', None)
-        region = data.get('region', {'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2, 'z_min': -1, 'z_max': 1})
-        num_lines = data.get('num_lines', 20)
-        steps = data.get('steps', 100)
-        step_size = data.get('step_size', 0.05)
-
-        Fx_func = lambdify((x, y, z), vf[0], modules=SCALAR_MODULES)
-        Fy_func = lambdify((x, y, z), vf[1], modules=SCALAR_MODULES)
-        Fz_func = lambdify((x, y, z), vf[2], modules=SCALAR_MODULES)
-
-        if start_points is None:
-            x_min, x_max = float(region['x_min']), float(region['x_max'])
-            y_min, y_max = float(region['y_min']), float(region['y_max'])
-            z_val = (float(region.get('z_min', 0)) + float(region.get('z_max', 0))) / 2
-            n_side = int(math.sqrt(num_lines))
-            xs = torch.linspace(x_min + 0.2, x_max - 0.2, max(n_side, 1))
-            ys = torch.linspace(y_min + 0.2, y_max - 0.2, max(n_side, 1))
-            start_points = [[float(xi), float(yi), z_val] for xi in xs for yi in ys]
-
-        field_lines = []
-        for start in start_points[:num_lines]:
-            line = [start]
-            pos = [float(start[0]), float(start[1]), float(start[2])]
-            for _ in range(steps):
-                try:
-                    fx = float(Fx_func(pos[0], pos[1], pos[2]))
-                    fy = float(Fy_func(pos[0], pos[1], pos[2]))
-                    fz = float(Fz_func(pos[0], pos[1], pos[2]))
-                    mag = math.sqrt(fx**2 + fy**2 + fz**2)
-                    if mag < 1e-10 or not math.isfinite(mag):
-                        break
-                    pos = [
-                        pos[0] + step_size * fx / mag,
-                        pos[1] + step_size * fy / mag,
-                        pos[2] + step_size * fz / mag,
-                    ]
-                    if not (float(region['x_min']) <= pos[0] <= float(region['x_max']) and
-                            float(region['y_min']) <= pos[1] <= float(region['y_max']) and
-                            float(region['z_min']) <= pos[2] <= float(region['z_max'])):
-                        break
-                    line.append(list(pos))
-                except Exception:
-                    break
-            if len(line) > 5:
-                field_lines.append(line)
+@msgpack_route(FieldLinesReq)
+async def compute_field_lines(req: FieldLinesReq):
+    vf = parse_vector_field(req.vector_field)
+    start_points = req.start_points
+    region = req.region
+    num_lines = req.num_lines
+    steps = req.steps
+    step_size = req.step_size
+
+    Fx_func, Fy_func, Fz_func = _compile_vf(vf)
+
+    if start_points is None:
+        x_min, x_max = float(region['x_min']), float(region['x_max'])
+        y_min, y_max = float(region['y_min']), float(region['y_max'])
+        z_val = (float(region.get('z_min', 0)) + float(region.get('z_max', 0))) / 2
+        n_side = int(math.sqrt(num_lines))
+        xs = np.linspace(x_min + 0.2, x_max - 0.2, max(n_side, 1))
+        ys = np.linspace(y_min + 0.2, y_max - 0.2, max(n_side, 1))
+        start_points = [[float(xi), float(yi), z_val] for xi in xs for yi in ys]
+
+    start_points = start_points[:num_lines]
+    positions, lengths = trace_field_lines(
+        start_points, region, step_size, steps, (Fx_func, Fy_func, Fz_func)
+    )
+    keep = lengths > 5
+    positions, lengths = positions[keep], lengths[keep]
 
-        return msgpack_response({
-            'success': True, 'field_lines': field_lines,
-            'num_lines': len(field_lines), 'region': region,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+    return msgpack_response({
+        'success': True,
+        'field_lines': _pack_f32(positions, lengths=lengths.tolist()),
+        'num_lines': int(len(lengths)), 'region': region,
+    })
 
 
 @app.post('/api/physics/equipotential')
-async def compute_equipotential(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        scalar_field = safe_parse(data.get('scalar_field', 'x^2 + y^2'))
-        region = data.get('region', {'x_min': -2, 'x_max': 2, 'y_min': -2, 'y_max': 2})
-        num_levels = data.get('num_levels', 10)
-        resolution = data.get('resolution', 50)
-
-        f_func = lambdify((x, y), scalar_field.subs(z, 0), modules=TORCH_MODULES)
-        x_min, x_max = float(region.get('x_min', -2)), float(region.get('x_max', 2))
-        y_min, y_max = float(region.get('y_min', -2)), float(region.get('y_max', 2))
-
-        X_arr = torch.linspace(x_min, x_max, resolution)
-        Y_arr = torch.linspace(y_min, y_max, resolution)
-        XX, YY = torch.meshgrid(X_arr, Y_arr, indexing='xy')
+@msgpack_route(EquipotentialReq)
+async def compute_equipotential(req: EquipotentialReq):
+    scalar_field = safe_parse(req.scalar_field)
+    region = req.region
+    num_levels = req.num_levels
+    resolution = req.resolution
+
+    f_func = lambdify_cached(scalar_field.subs(z, 0), (x, y), 'numpy')
+    x_min, x_max = float(region.get('x_min', -2)), float(region.get('x_max', 2))
+    y_min, y_max = float(region.get('y_min', -2)), float(region.get('y_max', 2))
+
+    X_arr = np.linspace(x_min, x_max, resolution)
+    Y_arr = np.linspace(y_min, y_max, resolution)
+    XX, YY = np.meshgrid(X_arr, Y_arr, indexing='xy')
+    with np.errstate(all='ignore'):
         ZZ = f_func(XX, YY)
-        if not isinstance(ZZ, torch.Tensor):
-            ZZ = torch.full_like(XX, float(ZZ))
-        ZZ = torch.nan_to_num(ZZ, nan=0.0, posinf=1e10, neginf=-1e10)
-
-        grad = compute_gradient_field(scalar_field.subs(z, 0))
-        grad_x_func = lambdify((x, y), grad[0].subs(z, 0), modules=SCALAR_MODULES)
-        grad_y_func = lambdify((x, y), grad[1].subs(z, 0), modules=SCALAR_MODULES)
-
-        gradient_arrows = []
-        for xi in torch.linspace(x_min, x_max, 10):
-            for yi in torch.linspace(y_min, y_max, 10):
-                try:
-                    gx = float(grad_x_func(float(xi), float(yi)))
-                    gy = float(grad_y_func(float(xi), float(yi)))
-                    if math.isfinite(gx) and math.isfinite(gy) and (abs(gx) > 1e-10 or abs(gy) > 1e-10):
-                        gradient_arrows.append({'origin': [float(xi), float(yi), 0], 'direction': [gx, gy, 0]})
-                except Exception:
-                    pass
+    if not isinstance(ZZ, np.ndarray):
+        ZZ = np.full_like(XX, float(ZZ))
+    ZZ = np.nan_to_num(ZZ, nan=0.0, posinf=1e10, neginf=-1e10)
 
-        return msgpack_response({
-            'success': True, 'scalar_field': str(scalar_field),
-            'contour_data': {'x': X_arr.tolist(), 'y': Y_arr.tolist(), 'z': ZZ.tolist()},
-            'gradient_arrows': gradient_arrows,
-            'z_min': float(ZZ.min()), 'z_max': float(ZZ.max()), 'num_levels': num_levels,
-        })
-    except Exception as e:
-        traceback.print_exc()
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+    grad = compute_gradient_field(scalar_field.subs(z, 0))
+    grad_x_func = lambdify_cached(grad[0].subs(z, 0), (x, y), 'numpy')
+    grad_y_func = lambdify_cached(grad[1].subs(z, 0), (x, y), 'numpy')
+
+    AX, AY = np.meshgrid(
+        np.linspace(x_min, x_max, 10), np.linspace(y_min, y_max, 10), indexing='xy'
+    )
+    with np.errstate(all='ignore'):
+        GX = grad_x_func(AX, AY)
+        GY = grad_y_func(AX, AY)
+    if not isinstance(GX, np.ndarray):
+        GX = np.full_like(AX, float(GX))
+    if not isinstance(GY, np.ndarray):
+        GY = np.full_like(AY, float(GY))
+    arrow_mask = (
+        np.isfinite(GX) & np.isfinite(GY) &
+        ((np.abs(GX) > 1e-10) | (np.abs(GY) > 1e-10))
+    )
+    gradient_arrows = [
+        {'origin': [ox, oy, 0], 'direction': [gx, gy, 0]}
+        for ox, oy, gx, gy in zip(
+            AX[arrow_mask].tolist(), AY[arrow_mask].tolist(),
+            GX[arrow_mask].tolist(), GY[arrow_mask].tolist(),
+        )
+    ]
+
+    return msgpack_response({
+        'success': True, 'scalar_field': str(scalar_field),
+        'contour_data': {'x': _pack_f32(X_arr), 'y': _pack_f32(Y_arr), 'z': _pack_f32(ZZ)},
+        'gradient_arrows': gradient_arrows,
+        'z_min': float(ZZ.min()), 'z_max': float(ZZ.max()), 'num_levels': num_levels,
+    })
 
 
 @app.get('/api/examples')
-async def api_get_examples():
-    return msgpack_response(get_examples())
+async def api_get_examples(request: Request):
+    return _static_msgpack(request, EXAMPLES_BLOB, EXAMPLES_ETAG, max_age=3600)
 
 
 @app.post('/api/export/latex')
-async def export_latex(request: Request):
-    if not check_rate_limit(request):
-        return msgpack_response({
-            'success': False,
-            'error': 'Rate limit exceeded. Please wait before making more requests.',
-        }, 429)
-    try:
-        data = await parse_msgpack_body(request)
-        integrand_expr = safe_parse(data.get('integrand', 'x^2'))
-        integrand_ltx = latex(integrand_expr)
-        integral_type = data.get('integral_type', '1d')
-        result = data.get('result', {})
-
-        if integral_type == '1d':
-            latex_str = f"\\int_{{{data.get('lower_bound', '0')}}}^{{{data.get('upper_bound', '1')}}} {integrand_ltx} \\, dx"
-        elif integral_type == '2d':
-            latex_str = f"\\iint_D {integrand_ltx} \\, dA"
-        elif integral_type == '3d':
-            latex_str = f"\\iiint_V {integrand_ltx} \\, dV"
-        else:
-            latex_str = integrand_ltx
-
-        if result.get('symbolic_latex'):
-            latex_str += f" = {result['symbolic_latex']}"
-        elif result.get('symbolic'):
-            latex_str += f" = {result['symbolic']}"
-
-        return msgpack_response({'success': True, 'latex': latex_str})
-    except Exception as e:
-        return msgpack_response({'success': False, 'error': str(e)}, 400)
+@msgpack_route(ExportLatexReq)
+async def export_latex(req: ExportLatexReq):
+    integrand_expr = safe_parse(req.integrand)
+    integrand_ltx = _latex(integrand_expr)
+    integral_type = req.integral_type
+    result = req.result
+
+    if integral_type == '1d':
+        latex_str = f"\\int_{{{req.lower_bound}}}^{{{req.upper_bound}}} {integrand_ltx} \\, dx"
+    elif integral_type == '2d':
+        latex_str = f"\\iint_D {integrand_ltx} \\, dA"
+    elif integral_type == '3d':
+        latex_str = f"\\iiint_V {integrand_ltx} \\, dV"
+    else:
+        latex_str = integrand_ltx
+
+    if result.get('symbolic_latex'):
+        latex_str += f" = {result['symbolic_latex']}"
+    elif result.get('symbolic'):
+        latex_str += f" = {result['symbolic']}"
+
+    return msgpack_response({'success': True, 'latex': latex_str})
 
 
 if __name__ == '__main__':
@@ -1,24 +1,73 @@
 """App config from env vars."""
 
 import os
-from typing import Optional
+from dataclasses import dataclass
 
 
-class Config:
-    """Application configuration."""
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """Application configuration, computed once at import time.
 
-    DEBUG: bool = os.getenv('APP_DEBUG', 'false').lower() in ('true', '1', 'yes')
-    HOST: str = os.getenv('APP_HOST', '0.0.0.0')
-    PORT: int = int(os.getenv('APP_PORT', '8000'))
-    CORS_ORIGINS: str = os.getenv('CORS_ORIGINS', '*')
+    Frozen slots make hot-path attribute lookups plain slot reads instead
+    of class-dict searches, and guarantee nothing mutates config at runtime.
+    """
+
+    DEBUG: bool
+    HOST: str
+    PORT: int
+    CORS_ORIGINS: str
+    CORS_ORIGINS_LIST: tuple
 
     # Computation limits
-    MAX_EXPRESSION_LENGTH: int = int(os.getenv('MAX_EXPRESSION_LENGTH', '500'))
-    MAX_MONTE_CARLO_SAMPLES: int = int(os.getenv('MAX_MONTE_CARLO_SAMPLES', '100000'))
-    COMPUTATION_TIMEOUT: int = int(os.getenv('COMPUTATION_TIMEOUT', '30'))
+    MAX_EXPRESSION_LENGTH: int
+    MAX_MONTE_CARLO_SAMPLES: int
+    COMPUTATION_TIMEOUT: int
+
+    # Monte Carlo device: 'auto' picks cuda when available
+    MC_DEVICE: str
+
+    # Monte Carlo sample dtype; error is O(1/sqrt(n)), so float32 is plenty
+    # and halves bandwidth ('bfloat16' halves it again on recent GPUs)
+    MC_DTYPE: str
+
+    # Fuse Monte Carlo integrands with torch.compile; off by default since
+    # the first-call compile cost only pays off on long-lived GPU deployments
+    USE_TORCH_COMPILE: bool
+
+    # 'sobol' (scrambled quasi-random, ~O(1/n) error on smooth integrands)
+    # or 'random' (plain pseudo-random)
+    MC_METHOD: str
 
     # Rate limiting
-    RATE_LIMIT_PER_MINUTE: int = int(os.getenv('RATE_LIMIT_PER_MINUTE', '60'))
+    RATE_LIMIT_PER_MINUTE: int
+
+    # Worker processes for CPU-bound sympy work (0 runs inline)
+    POOL_WORKERS: int
+
+    # Full simplify() on symbolic outputs; disabled, the cheaper cancel() is used
+    SIMPLIFY_OUTPUT: bool
 
     # Logging
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL: str
+
+
+_cors_origins = os.getenv('CORS_ORIGINS', '*')
+
+Config = _Config(
+    DEBUG=os.getenv('APP_DEBUG', 'false').lower() in ('true', '1', 'yes'),
+    HOST=os.getenv('APP_HOST', '0.0.0.0'),
+    PORT=int(os.getenv('APP_PORT', '8000')),
+    CORS_ORIGINS=_cors_origins,
+    CORS_ORIGINS_LIST=tuple(_cors_origins.split(',')) if _cors_origins != '*' else ('*',),
+    MAX_EXPRESSION_LENGTH=int(os.getenv('MAX_EXPRESSION_LENGTH', '500')),
+    MAX_MONTE_CARLO_SAMPLES=int(os.getenv('MAX_MONTE_CARLO_SAMPLES', '100000')),
+    COMPUTATION_TIMEOUT=int(os.getenv('COMPUTATION_TIMEOUT', '30')),
+    MC_DEVICE=os.getenv('MC_DEVICE', 'auto'),
+    MC_DTYPE=os.getenv('MC_DTYPE', 'float32'),
+    USE_TORCH_COMPILE=os.getenv('USE_TORCH_COMPILE', 'false').lower() in ('true', '1', 'yes'),
+    MC_METHOD=os.getenv('MC_METHOD', 'sobol'),
+    RATE_LIMIT_PER_MINUTE=int(os.getenv('RATE_LIMIT_PER_MINUTE', '60')),
+    POOL_WORKERS=int(os.getenv('POOL_WORKERS', str(os.cpu_count() or 1))),
+    SIMPLIFY_OUTPUT=os.getenv('SIMPLIFY_OUTPUT', 'true').lower() in ('true', '1', 'yes'),
+    LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO'),
+)
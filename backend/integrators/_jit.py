@@ -0,0 +1,65 @@
+"""Numba-compiled C callbacks for scipy quadrature.
+
+QUADPACK crosses the Python/C boundary once per sample point; handing it a
+``scipy.LowLevelCallable`` built from a numba ``cfunc`` keeps the whole
+sampling loop in native code. Everything here is best-effort: callers fall
+back to the plain lambdified function when numba is missing or the
+expression doesn't compile.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+from backend.parsers import lambdify_cached
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+    from numba import types
+    import scipy
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    # scipy.LowLevelCallable convention: double func(int n, double *xx)
+    _QUAD_SIG = types.float64(types.intc, types.CPointer(types.float64))
+
+
+@lru_cache(maxsize=256)
+def _make_ll_callable(expr, variables):
+    func = lambdify_cached(expr, variables, 'scalar', jit=True)
+    if not hasattr(func, 'nopython_signatures'):
+        return None  # njit compilation failed; no point wrapping
+
+    n_vars = len(variables)
+    if n_vars == 1:
+        @numba.cfunc(_QUAD_SIG)
+        def callback(n, xx):
+            return func(xx[0])
+    elif n_vars == 2:
+        @numba.cfunc(_QUAD_SIG)
+        def callback(n, xx):
+            return func(xx[0], xx[1])
+    else:
+        return None
+
+    return scipy.LowLevelCallable(callback.ctypes)
+
+
+def quad_callable(expr, variables):
+    """Best-effort LowLevelCallable for ``expr``; None when unavailable.
+
+    For multi-variable expressions, ``variables`` must be ordered the way
+    scipy passes arguments (innermost integration variable first).
+    """
+    if not _HAS_NUMBA:
+        return None
+    try:
+        return _make_ll_callable(expr, tuple(variables))
+    except Exception:
+        logger.debug("cfunc compilation failed, using Python callback", exc_info=True)
+        return None
@@ -4,48 +4,55 @@ from __future__ import annotations
 
 import logging
 import math
-import traceback
 from typing import Dict, Any
 
-from sympy import integrate, simplify, latex, N, lambdify, pi, sin, cos
+from sympy import integrate, simplify, latex, N, pi, sin, cos
 from scipy import integrate as scipy_integrate
 
-from backend.parsers import x, y, r, theta, safe_parse, SCALAR_MODULES
+from backend.parsers import x, y, r, theta, safe_parse, lambdify_cached, fast_scalar_lambdify, simplify_output, parse_bounds
+from backend.integrators.quadrature import gauss_quad_vec_2d
 
 logger = logging.getLogger(__name__)
 
 
-def compute_integral_2d(integrand_expr, region: dict) -> Dict[str, Any]:
-    """Compute a 2D integral over a specified region."""
+def compute_integral_2d(integrand_expr, region: dict, symbolic: bool = True) -> Dict[str, Any]:
+    """Compute a 2D integral over a specified region.
+
+    With ``symbolic=False`` the sympy integrate() attempt is skipped and
+    only the numerical result is returned.
+    """
     try:
         region_type = region.get('type', 'rectangle')
         symbolic_result = None
 
-        if region_type == 'rectangle':
-            x_min = safe_parse(str(region['x_min']))
-            x_max = safe_parse(str(region['x_max']))
-            y_min = safe_parse(str(region['y_min']))
-            y_max = safe_parse(str(region['y_max']))
+        if not symbolic:
+            pass
+
+        elif region_type == 'rectangle':
+            x_min = parse_bounds(region['x_min'])
+            x_max = parse_bounds(region['x_max'])
+            y_min = parse_bounds(region['y_min'])
+            y_max = parse_bounds(region['y_max'])
             symbolic_result = integrate(integrand_expr, (y, y_min, y_max), (x, x_min, x_max))
 
         elif region_type == 'disk':
             cx, cy = region.get('center', [0, 0])
-            radius = safe_parse(str(region['radius']))
-            polar_integrand = integrand_expr.subs(
-                [(x, r * cos(theta) + cx), (y, r * sin(theta) + cy)]
+            radius = parse_bounds(region['radius'])
+            polar_integrand = integrand_expr.xreplace(
+                {x: r * cos(theta) + cx, y: r * sin(theta) + cy}
             ) * r
             symbolic_result = integrate(polar_integrand, (r, 0, radius), (theta, 0, 2 * pi))
 
         elif region_type == 'type_1':
-            x_min = safe_parse(str(region['x_min']))
-            x_max = safe_parse(str(region['x_max']))
+            x_min = parse_bounds(region['x_min'])
+            x_max = parse_bounds(region['x_max'])
             y_lower = safe_parse(region['y_lower'])
             y_upper = safe_parse(region['y_upper'])
             symbolic_result = integrate(integrand_expr, (y, y_lower, y_upper), (x, x_min, x_max))
 
         elif region_type == 'type_2':
-            y_min = safe_parse(str(region['y_min']))
-            y_max = safe_parse(str(region['y_max']))
+            y_min = parse_bounds(region['y_min'])
+            y_max = parse_bounds(region['y_max'])
             x_lower = safe_parse(region['x_lower'])
             x_upper = safe_parse(region['x_upper'])
             symbolic_result = integrate(integrand_expr, (x, x_lower, x_upper), (y, y_min, y_max))
@@ -58,23 +65,25 @@ def compute_integral_2d(integrand_expr, region: dict) -> Dict[str, Any]:
             except Exception:
                 symbolic_value = None
 
+            simplified = simplify_output(symbolic_result)
             return {
-                'symbolic': str(simplify(symbolic_result)),
-                'symbolic_latex': latex(simplify(symbolic_result)),
+                'symbolic': str(simplified),
+                'symbolic_latex': latex(simplified),
                 'symbolic_value': symbolic_value,
                 'numerical': numerical_result['value'],
                 'error': numerical_result['error'],
             }
         else:
             return {
-                'symbolic': 'Symbolic integration not available for this region type',
+                'symbolic': ('Symbolic integration skipped' if not symbolic
+                             else 'Symbolic integration not available for this region type'),
                 'symbolic_latex': r'\text{N/A}',
                 'numerical': numerical_result['value'],
                 'error': numerical_result['error'],
             }
 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("2D integration failed")
         try:
             numerical_result = compute_numerical_2d(integrand_expr, region)
             return {
@@ -89,14 +98,15 @@ def compute_integral_2d(integrand_expr, region: dict) -> Dict[str, Any]:
 
 def compute_numerical_2d(integrand_expr, region: dict) -> Dict[str, float]:
     """Compute a 2D integral numerically."""
-    f = lambdify((x, y), integrand_expr, modules=SCALAR_MODULES)
+    f = fast_scalar_lambdify(integrand_expr, (x, y)) or lambdify_cached(integrand_expr, (x, y), 'scalar', cse=True)
     region_type = region.get('type', 'rectangle')
 
     if region_type == 'rectangle':
         x_min, x_max = float(region['x_min']), float(region['x_max'])
         y_min, y_max = float(region['y_min']), float(region['y_max'])
-        result, error = scipy_integrate.dblquad(
-            f, x_min, x_max, lambda _x: y_min, lambda _x: y_max
+        f_np = lambdify_cached(integrand_expr, (x, y), 'numpy', cse=True)
+        result, error = gauss_quad_vec_2d(
+            f_np, x_min, x_max, lambda _x: y_min, lambda _x: y_max
         )
 
     elif region_type == 'disk':
@@ -114,19 +124,20 @@ def compute_numerical_2d(integrand_expr, region: dict) -> Dict[str, float]:
 
     elif region_type == 'type_1':
         x_min, x_max = float(region['x_min']), float(region['x_max'])
-        y_lower_func = lambdify(x, safe_parse(region['y_lower']), modules=SCALAR_MODULES)
-        y_upper_func = lambdify(x, safe_parse(region['y_upper']), modules=SCALAR_MODULES)
-        result, error = scipy_integrate.dblquad(f, x_min, x_max, y_lower_func, y_upper_func)
+        f_np = lambdify_cached(integrand_expr, (x, y), 'numpy', cse=True)
+        y_lower_func = lambdify_cached(safe_parse(region['y_lower']), (x,), 'numpy')
+        y_upper_func = lambdify_cached(safe_parse(region['y_upper']), (x,), 'numpy')
+        result, error = gauss_quad_vec_2d(f_np, x_min, x_max, y_lower_func, y_upper_func)
 
     elif region_type == 'type_2':
         y_min, y_max = float(region['y_min']), float(region['y_max'])
-        x_lower_func = lambdify(y, safe_parse(region['x_lower']), modules=SCALAR_MODULES)
-        x_upper_func = lambdify(y, safe_parse(region['x_upper']), modules=SCALAR_MODULES)
-
-        def f_swapped(y_val, x_val):
-            return f(x_val, y_val)
+        x_lower_func = lambdify_cached(safe_parse(region['x_lower']), (y,), 'scalar')
+        x_upper_func = lambdify_cached(safe_parse(region['x_upper']), (y,), 'scalar')
 
-        result, error = scipy_integrate.dblquad(f_swapped, y_min, y_max, x_lower_func, x_upper_func)
+        # dblquad calls func(inner, outer) — here (x, y) — so f can be
+        # passed straight through; the old swap closure inverted the
+        # arguments (and cost an extra Python frame per sample)
+        result, error = scipy_integrate.dblquad(f, y_min, y_max, x_lower_func, x_upper_func)
 
     else:
         raise ValueError(f"Numerical integration not implemented for region type: {region_type}")
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import logging
-import traceback
 from typing import Dict, Any, Tuple
 
-from sympy import integrate, simplify, latex, N, lambdify, sqrt, diff
+from sympy import integrate, simplify, latex, N, sqrt
 from scipy import integrate as scipy_integrate
 
-from backend.parsers import x, y, z, t, safe_parse, SCALAR_MODULES
+from backend.parsers import x, y, z, t, safe_parse, lambdify_cached, fast_scalar_lambdify, diff_cached, simplify_output, parse_bounds
+from backend.integrators._jit import quad_callable
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +20,35 @@ def compute_line_integral_scalar(integrand_expr, curve: dict, t_start, t_end) ->
         x_t = safe_parse(curve.get('x', 't'))
         y_t = safe_parse(curve.get('y', '0'))
         z_t = safe_parse(curve.get('z', '0'))
-        t_start = safe_parse(str(t_start))
-        t_end = safe_parse(str(t_end))
+        t_start = parse_bounds(t_start)
+        t_end = parse_bounds(t_end)
 
-        dx_dt = diff(x_t, t)
-        dy_dt = diff(y_t, t)
-        dz_dt = diff(z_t, t)
+        dx_dt = diff_cached(x_t, t)
+        dy_dt = diff_cached(y_t, t)
+        dz_dt = diff_cached(z_t, t)
 
         ds = sqrt(dx_dt**2 + dy_dt**2 + dz_dt**2)
-        integrand_on_curve = integrand_expr.subs([(x, x_t), (y, y_t), (z, z_t)])
+        integrand_on_curve = integrand_expr.xreplace({x: x_t, y: y_t, z: z_t})
         full_integrand = integrand_on_curve * ds
 
         symbolic_result = integrate(full_integrand, (t, t_start, t_end))
 
-        f_numerical = lambdify(t, full_integrand, modules=SCALAR_MODULES)
+        f_numerical = (quad_callable(full_integrand, (t,)) or fast_scalar_lambdify(full_integrand, (t,))
+                       or lambdify_cached(full_integrand, (t,), 'scalar', cse=True))
         numerical_result, error = scipy_integrate.quad(
             f_numerical, float(t_start), float(t_end)
         )
 
+        simplified = simplify_output(symbolic_result)
         return {
-            'symbolic': str(simplify(symbolic_result)),
-            'symbolic_latex': latex(simplify(symbolic_result)),
+            'symbolic': str(simplified),
+            'symbolic_latex': latex(simplified),
             'numerical': float(numerical_result),
             'error': float(error),
-            'integrand_latex': latex(simplify(full_integrand)),
+            'integrand_latex': latex(simplify_output(full_integrand)),
         }
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("scalar line integral failed")
         raise ValueError(f"Line integral computation failed: {str(e)}")
 
 
@@ -60,33 +62,35 @@ def compute_line_integral_vector(
         x_t = safe_parse(curve.get('x', 't'))
         y_t = safe_parse(curve.get('y', '0'))
         z_t = safe_parse(curve.get('z', '0'))
-        t_start = safe_parse(str(t_start))
-        t_end = safe_parse(str(t_end))
+        t_start = parse_bounds(t_start)
+        t_end = parse_bounds(t_end)
 
-        dx_dt = diff(x_t, t)
-        dy_dt = diff(y_t, t)
-        dz_dt = diff(z_t, t)
+        dx_dt = diff_cached(x_t, t)
+        dy_dt = diff_cached(y_t, t)
+        dz_dt = diff_cached(z_t, t)
 
-        Fx_on_curve = Fx.subs([(x, x_t), (y, y_t), (z, z_t)])
-        Fy_on_curve = Fy.subs([(x, x_t), (y, y_t), (z, z_t)])
-        Fz_on_curve = Fz.subs([(x, x_t), (y, y_t), (z, z_t)])
+        Fx_on_curve = Fx.xreplace({x: x_t, y: y_t, z: z_t})
+        Fy_on_curve = Fy.xreplace({x: x_t, y: y_t, z: z_t})
+        Fz_on_curve = Fz.xreplace({x: x_t, y: y_t, z: z_t})
 
         integrand = Fx_on_curve * dx_dt + Fy_on_curve * dy_dt + Fz_on_curve * dz_dt
 
         symbolic_result = integrate(integrand, (t, t_start, t_end))
 
-        f_numerical = lambdify(t, integrand, modules=SCALAR_MODULES)
+        f_numerical = (quad_callable(integrand, (t,)) or fast_scalar_lambdify(integrand, (t,))
+                       or lambdify_cached(integrand, (t,), 'scalar', cse=True))
         numerical_result, error = scipy_integrate.quad(
             f_numerical, float(t_start), float(t_end)
         )
 
+        simplified = simplify_output(symbolic_result)
         return {
-            'symbolic': str(simplify(symbolic_result)),
-            'symbolic_latex': latex(simplify(symbolic_result)),
+            'symbolic': str(simplified),
+            'symbolic_latex': latex(simplified),
             'numerical': float(numerical_result),
             'error': float(error),
-            'integrand_latex': latex(simplify(integrand)),
+            'integrand_latex': latex(simplify_output(integrand)),
         }
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("vector line integral failed")
         raise ValueError(f"Vector line integral computation failed: {str(e)}")
@@ -0,0 +1,121 @@
+"""Vectorized quadrature helpers built on scipy and Gauss-Kronrod rules."""
+
+from __future__ import annotations
+
+import heapq
+import math
+
+import numpy as np
+from scipy.integrate import quad_vec
+
+# 21-point Gauss-Kronrod rule (QUADPACK's dqk21 tables): Kronrod nodes
+# and weights for the positive half-interval, plus the weights of the
+# embedded 10-point Gauss rule, whose nodes are the odd-indexed Kronrod
+# abscissae
+_GK21_NODES_HALF = np.array([
+    0.995657163025808080735527280689003,
+    0.973906528517171720077964012084452,
+    0.930157491355708226001207180059508,
+    0.865063366688984510732096688423493,
+    0.780817726586416897063717578345042,
+    0.679409568299024406234327365114874,
+    0.562757134668604683339000099272694,
+    0.433395394129247190799265943165784,
+    0.294392862701460198131126603103866,
+    0.148874338981631210884826001129720,
+    0.000000000000000000000000000000000,
+])
+_GK21_WEIGHTS_HALF = np.array([
+    0.011694638867371874278064396062192,
+    0.032558162307964727478818972459390,
+    0.054755896574351996031381300244580,
+    0.075039674810919952767043140916190,
+    0.093125454583697605535065465083366,
+    0.109387158802297641899210590325805,
+    0.123491976262065851077958109831074,
+    0.134709217311473325928054001771707,
+    0.142775938577060080797094273138717,
+    0.147739104901338491374841515972068,
+    0.149445554002916905664936468389821,
+])
+_G10_WEIGHTS_HALF = np.array([
+    0.066671344308688137593568809893332,
+    0.149451349150580593145776339657697,
+    0.219086362515982043995534934228163,
+    0.269266719309996355091226921569469,
+    0.295524224714752870173892994651338,
+])
+
+# Full 21-node arrays in ascending order, mirrored from the half tables
+_GK21_NODES = np.concatenate((-_GK21_NODES_HALF[:-1], _GK21_NODES_HALF[::-1]))
+_GK21_WEIGHTS = np.concatenate((_GK21_WEIGHTS_HALF[:-1], _GK21_WEIGHTS_HALF[::-1]))
+_G10_IDX = np.arange(1, 20, 2)
+_G10_WEIGHTS = np.concatenate((_G10_WEIGHTS_HALF, _G10_WEIGHTS_HALF[::-1]))
+
+
+def adaptive_gk21(f, a, b, tol=1e-9, limit=64):
+    """Globally adaptive Gauss-Kronrod 21-point quadrature over ``[a, b]``.
+
+    ``f`` must accept a numpy array of abscissae and return values of the
+    same shape, so each subinterval costs one vectorized call instead of
+    21 Python round-trips as with ``quad``. Subintervals sit in a heap
+    keyed on their Kronrod-minus-Gauss error estimate; the worst one is
+    bisected until the summed error drops below ``tol`` or ``limit``
+    rule evaluations have been spent. Returns ``(value, error)``.
+    """
+    def rule(lo, hi):
+        mid = 0.5 * (lo + hi)
+        half = 0.5 * (hi - lo)
+        with np.errstate(all='ignore'):
+            vals = np.asarray(f(mid + half * _GK21_NODES), dtype=float)
+        kron = half * float(_GK21_WEIGHTS @ vals)
+        gauss = half * float(_G10_WEIGHTS @ vals[_G10_IDX])
+        return kron, abs(kron - gauss)
+
+    value, error = rule(a, b)
+    total_value, total_error = value, error
+    heap = [(-error, a, b, value)]
+    evaluations = 1
+    while total_error > tol and evaluations < limit and math.isfinite(total_value):
+        neg_err, lo, hi, old = heapq.heappop(heap)
+        mid = 0.5 * (lo + hi)
+        left_val, left_err = rule(lo, mid)
+        right_val, right_err = rule(mid, hi)
+        total_value += left_val + right_val - old
+        total_error += left_err + right_err + neg_err
+        heapq.heappush(heap, (-left_err, lo, mid, left_val))
+        heapq.heappush(heap, (-right_err, mid, hi, right_val))
+        evaluations += 2
+    return float(total_value), float(total_error)
+
+
+def gauss_quad_vec_2d(f, x_min, x_max, y_lower, y_upper, n_nodes=64):
+    """Integrate ``f`` over ``x in [x_min, x_max]``, ``y in [y_lower(x), y_upper(x)]``.
+
+    ``f`` must accept numpy arrays and is always evaluated as ``f(X, Y)``
+    with the outer variable first. The outer integral uses fixed
+    Gauss-Legendre nodes; the inner one goes through ``quad_vec`` after
+    substituting ``y = y_lo + s * (y_hi - y_lo)``, so each adaptive inner
+    sample evaluates the integrand at every outer node in one vectorized
+    call instead of one Python call per point pair as with ``dblquad``.
+
+    ``y_lower``/``y_upper`` are callables of the outer variable (constant
+    bounds can ignore their argument). Returns ``(value, error_estimate)``.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(n_nodes)
+    half_width = 0.5 * (x_max - x_min)
+    xs = half_width * nodes + 0.5 * (x_max + x_min)
+
+    y_lo = np.broadcast_to(np.asarray(y_lower(xs), dtype=float), xs.shape)
+    y_hi = np.broadcast_to(np.asarray(y_upper(xs), dtype=float), xs.shape)
+    spans = y_hi - y_lo
+
+    def integrand(s):
+        with np.errstate(all='ignore'):
+            vals = np.asarray(f(xs, y_lo + s * spans), dtype=float)
+        return np.broadcast_to(vals, xs.shape) * spans
+
+    inner, inner_err = quad_vec(integrand, 0.0, 1.0)
+    value = half_width * float(np.dot(weights, inner))
+    error = abs(half_width) * float(np.sum(np.abs(weights))) * float(inner_err)
+    return value, error
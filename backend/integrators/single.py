@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import logging
-import traceback
 from typing import Dict, Any, Optional
 
-from sympy import integrate, simplify, latex, N, lambdify
+from sympy import integrate, simplify, latex, N
 from scipy import integrate as scipy_integrate
 
-from backend.parsers import x, safe_parse, SCALAR_MODULES
+from backend.parsers import x, safe_parse, lambdify_cached, fast_scalar_lambdify, simplify_output
+from backend.integrators._jit import quad_callable
 
 logger = logging.getLogger(__name__)
 
 
-def compute_integral_1d(integrand_expr, a, b) -> Dict[str, Any]:
-    """Compute a 1D definite integral symbolically and numerically."""
+def compute_integral_1d(integrand_expr, a, b, symbolic: bool = True) -> Dict[str, Any]:
+    """Compute a 1D definite integral symbolically and numerically.
+
+    With ``symbolic=False`` (interactive slider updates) the sympy
+    integrate() attempt — usually the dominant cost — is skipped.
+    """
+    if not symbolic:
+        f = (quad_callable(integrand_expr, (x,)) or fast_scalar_lambdify(integrand_expr, (x,))
+             or lambdify_cached(integrand_expr, (x,), 'scalar'))
+        numerical_result, error = scipy_integrate.quad(f, float(a), float(b))
+        return {
+            'symbolic': 'Symbolic integration skipped',
+            'symbolic_latex': r'\text{skipped}',
+            'numerical': float(numerical_result),
+            'error': float(error),
+        }
+
     try:
         symbolic_result = integrate(integrand_expr, (x, a, b))
         symbolic_value = complex(N(symbolic_result))
@@ -23,18 +38,21 @@ def compute_integral_1d(integrand_expr, a, b) -> Dict[str, Any]:
         if symbolic_value.imag == 0:
             symbolic_value = symbolic_value.real
 
-        f = lambdify(x, integrand_expr, modules=SCALAR_MODULES)
+        f = (quad_callable(integrand_expr, (x,)) or fast_scalar_lambdify(integrand_expr, (x,))
+             or lambdify_cached(integrand_expr, (x,), 'scalar'))
         numerical_result, error = scipy_integrate.quad(f, float(a), float(b))
 
+        simplified = simplify_output(symbolic_result)
         return {
-            'symbolic': str(simplify(symbolic_result)),
-            'symbolic_latex': latex(simplify(symbolic_result)),
+            'symbolic': str(simplified),
+            'symbolic_latex': latex(simplified),
             'numerical': float(numerical_result),
             'error': float(error),
         }
     except Exception as e:
         try:
-            f = lambdify(x, integrand_expr, modules=SCALAR_MODULES)
+            f = (quad_callable(integrand_expr, (x,)) or fast_scalar_lambdify(integrand_expr, (x,))
+                 or lambdify_cached(integrand_expr, (x,), 'scalar'))
             numerical_result, error = scipy_integrate.quad(f, float(a), float(b))
             return {
                 'symbolic': 'Could not compute symbolic result',
@@ -57,11 +75,13 @@ def generate_step_by_step_1d(integrand_expr, a, b) -> list:
     antideriv = integrate(integrand_expr, x)
     steps.append({
         'description': 'Find the antiderivative',
-        'latex': f'F(x) = {latex(simplify(antideriv))}'
+        'latex': f'F(x) = {latex(antideriv)}'
     })
 
-    upper_val = simplify(antideriv.subs(x, b))
-    lower_val = simplify(antideriv.subs(x, a))
+    # Display the raw bound substitutions; the one simplify pass below
+    # produces the final value
+    upper_val = antideriv.xreplace({x: b})
+    lower_val = antideriv.xreplace({x: a})
     steps.append({
         'description': 'Evaluate at the bounds',
         'latex': f'F({latex(b)}) - F({latex(a)}) = {latex(upper_val)} - {latex(lower_val)}'
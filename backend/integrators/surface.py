@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import logging
-import traceback
 from typing import Dict, Any, Tuple
 
-from sympy import integrate, simplify, latex, N, lambdify, sqrt, diff, Matrix
+from sympy import integrate, simplify, latex, N, sqrt
 from scipy import integrate as scipy_integrate
 
-from backend.parsers import x, y, z, u, v, safe_parse, SCALAR_MODULES
+from backend.parsers import x, y, z, u, v, safe_parse, lambdify_cached, diff_cached, simplify_output, parse_bounds
+from backend.integrators.quadrature import gauss_quad_vec_2d
 
 logger = logging.getLogger(__name__)
 
@@ -23,39 +23,49 @@ def compute_surface_integral_scalar(
         y_uv = safe_parse(surface.get('y', 'v'))
         z_uv = safe_parse(surface.get('z', '0'))
 
-        u_start = safe_parse(str(u_range[0]))
-        u_end = safe_parse(str(u_range[1]))
-        v_start = safe_parse(str(v_range[0]))
-        v_end = safe_parse(str(v_range[1]))
+        u_start = parse_bounds(u_range[0])
+        u_end = parse_bounds(u_range[1])
+        v_start = parse_bounds(v_range[0])
+        v_end = parse_bounds(v_range[1])
 
-        r_u = Matrix([diff(x_uv, u), diff(y_uv, u), diff(z_uv, u)])
-        r_v = Matrix([diff(x_uv, v), diff(y_uv, v), diff(z_uv, v)])
+        dxu, dyu, dzu = diff_cached(x_uv, u), diff_cached(y_uv, u), diff_cached(z_uv, u)
+        dxv, dyv, dzv = diff_cached(x_uv, v), diff_cached(y_uv, v), diff_cached(z_uv, v)
 
-        cross_product = r_u.cross(r_v)
-        dS = sqrt(cross_product[0]**2 + cross_product[1]**2 + cross_product[2]**2)
+        # Plain tuple cross product; always R^3, no Matrix machinery needed
+        cross_product = (
+            dyu * dzv - dzu * dyv,
+            dzu * dxv - dxu * dzv,
+            dxu * dyv - dyu * dxv,
+        )
+        # Simplify dS once up front: the simplified form feeds both the
+        # symbolic integration and the display output
+        dS = simplify_output(
+            sqrt(cross_product[0]**2 + cross_product[1]**2 + cross_product[2]**2)
+        )
 
-        integrand_on_surface = integrand_expr.subs([(x, x_uv), (y, y_uv), (z, z_uv)])
+        integrand_on_surface = integrand_expr.xreplace({x: x_uv, y: y_uv, z: z_uv})
         full_integrand = integrand_on_surface * dS
 
         symbolic_result = integrate(full_integrand, (v, v_start, v_end), (u, u_start, u_end))
 
-        f_numerical = lambdify((u, v), full_integrand, modules=SCALAR_MODULES)
-        numerical_result, error = scipy_integrate.dblquad(
+        f_numerical = lambdify_cached(full_integrand, (u, v), 'numpy', cse=True)
+        numerical_result, error = gauss_quad_vec_2d(
             f_numerical,
             float(u_start), float(u_end),
             lambda _u: float(v_start), lambda _u: float(v_end)
         )
 
+        simplified = simplify_output(symbolic_result)
         return {
-            'symbolic': str(simplify(symbolic_result)),
-            'symbolic_latex': latex(simplify(symbolic_result)),
+            'symbolic': str(simplified),
+            'symbolic_latex': latex(simplified),
             'numerical': float(numerical_result),
             'error': float(error),
             'normal_vector': [str(cross_product[i]) for i in range(3)],
-            'dS_latex': latex(simplify(dS)),
+            'dS_latex': latex(dS),
         }
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("surface integral failed")
         raise ValueError(f"Surface integral computation failed: {str(e)}")
 
 
@@ -70,18 +80,25 @@ def compute_flux_integral(
         y_uv = safe_parse(surface.get('y', 'v'))
         z_uv = safe_parse(surface.get('z', '0'))
 
-        u_start = safe_parse(str(u_range[0]))
-        u_end = safe_parse(str(u_range[1]))
-        v_start = safe_parse(str(v_range[0]))
-        v_end = safe_parse(str(v_range[1]))
+        u_start = parse_bounds(u_range[0])
+        u_end = parse_bounds(u_range[1])
+        v_start = parse_bounds(v_range[0])
+        v_end = parse_bounds(v_range[1])
 
-        r_u = Matrix([diff(x_uv, u), diff(y_uv, u), diff(z_uv, u)])
-        r_v = Matrix([diff(x_uv, v), diff(y_uv, v), diff(z_uv, v)])
-        cross_product = r_u.cross(r_v)
+        dxu, dyu, dzu = diff_cached(x_uv, u), diff_cached(y_uv, u), diff_cached(z_uv, u)
+        dxv, dyv, dzv = diff_cached(x_uv, v), diff_cached(y_uv, v), diff_cached(z_uv, v)
 
-        Fx_on_surface = Fx.subs([(x, x_uv), (y, y_uv), (z, z_uv)])
-        Fy_on_surface = Fy.subs([(x, x_uv), (y, y_uv), (z, z_uv)])
-        Fz_on_surface = Fz.subs([(x, x_uv), (y, y_uv), (z, z_uv)])
+        # Simplify the normal once; the integrand, integrate() and the
+        # response all reuse the simplified components
+        cross_product = (
+            simplify_output(dyu * dzv - dzu * dyv),
+            simplify_output(dzu * dxv - dxu * dzv),
+            simplify_output(dxu * dyv - dyu * dxv),
+        )
+
+        Fx_on_surface = Fx.xreplace({x: x_uv, y: y_uv, z: z_uv})
+        Fy_on_surface = Fy.xreplace({x: x_uv, y: y_uv, z: z_uv})
+        Fz_on_surface = Fz.xreplace({x: x_uv, y: y_uv, z: z_uv})
 
         integrand = (
             Fx_on_surface * cross_product[0] +
@@ -91,21 +108,22 @@ def compute_flux_integral(
 
         symbolic_result = integrate(integrand, (v, v_start, v_end), (u, u_start, u_end))
 
-        f_numerical = lambdify((u, v), integrand, modules=SCALAR_MODULES)
-        numerical_result, error = scipy_integrate.dblquad(
+        f_numerical = lambdify_cached(integrand, (u, v), 'numpy', cse=True)
+        numerical_result, error = gauss_quad_vec_2d(
             f_numerical,
             float(u_start), float(u_end),
             lambda _u: float(v_start), lambda _u: float(v_end)
         )
 
+        simplified = simplify_output(symbolic_result)
         return {
-            'symbolic': str(simplify(symbolic_result)),
-            'symbolic_latex': latex(simplify(symbolic_result)),
+            'symbolic': str(simplified),
+            'symbolic_latex': latex(simplified),
             'numerical': float(numerical_result),
             'error': float(error),
-            'normal_vector': [str(simplify(cross_product[i])) for i in range(3)],
-            'integrand_latex': latex(simplify(integrand)),
+            'normal_vector': [str(cross_product[i]) for i in range(3)],
+            'integrand_latex': latex(simplify_output(integrand)),
         }
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("flux integral failed")
         raise ValueError(f"Flux integral computation failed: {str(e)}")
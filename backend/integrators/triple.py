@@ -4,56 +4,113 @@ from __future__ import annotations
 
 import logging
 import math
-import traceback
+from functools import lru_cache
 from typing import Dict, Any
 
+import numpy as np
 import torch
-from sympy import integrate, simplify, latex, N, lambdify, pi, sin, cos
+from sympy import integrate, simplify, latex, N, pi, sin, cos
 
-from backend.parsers import x, y, z, r, theta, phi, safe_parse, TORCH_MODULES
+try:
+    import numba
+    from numba import types as nb_types
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+from backend.parsers import x, y, z, r, theta, phi, safe_parse, lambdify_cached, simplify_output, parse_bounds
 from backend.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Monte Carlo sampling is embarrassingly parallel elementwise torch work,
+# so run it on the GPU when one is available (MC_DEVICE overrides)
+_MC_DEVICE = torch.device(
+    Config.MC_DEVICE if Config.MC_DEVICE != 'auto'
+    else ('cuda' if torch.cuda.is_available() else 'cpu')
+)
+_MC_DTYPE = getattr(torch, Config.MC_DTYPE)
+
+# Samples per batch; keeps peak memory at O(chunk) instead of O(n_samples)
+_MC_CHUNK = 1 << 20
+
+# Scrambled Sobol replicates used for the quasi-Monte Carlo error estimate
+_SOBOL_REPLICATES = 8
+
+if _HAS_NUMBA:
+    # Typed against a generic scalar-field function type (as in
+    # backend.stream) so one cached specialization serves every integrand
+    _scalar3 = nb_types.FunctionType(
+        nb_types.float64(nb_types.float64, nb_types.float64, nb_types.float64)
+    )
+    _reduce_sig = nb_types.UniTuple(nb_types.float64, 2)(
+        nb_types.float64[::1], nb_types.float64[::1], nb_types.float64[::1], _scalar3
+    )
+
+    @numba.njit(_reduce_sig, parallel=True, fastmath=True, cache=True)
+    def _mc_reduce(xs, ys, zs, f):
+        """Fused evaluate + sanitize + sum/sum-of-squares over one batch."""
+        n = xs.shape[0]
+        total = 0.0
+        total_sq = 0.0
+        for i in numba.prange(n):
+            v = f(xs[i], ys[i], zs[i])
+            if v != v:
+                v = 0.0
+            elif v > 1e10:
+                v = 1e10
+            elif v < -1e10:
+                v = -1e10
+            total += v
+            total_sq += v * v
+        return total, total_sq
+
+
+def compute_integral_3d(integrand_expr, region: dict, symbolic: bool = True) -> Dict[str, Any]:
+    """Compute a 3D integral over a specified region.
 
-def compute_integral_3d(integrand_expr, region: dict) -> Dict[str, Any]:
-    """Compute a 3D integral over a specified region."""
+    With ``symbolic=False`` the sympy integrate() attempt is skipped and
+    only the Monte Carlo result is returned.
+    """
     try:
         region_type = region.get('type', 'box')
         symbolic_result = None
 
-        if region_type == 'box':
-            x_min = safe_parse(str(region['x_min']))
-            x_max = safe_parse(str(region['x_max']))
-            y_min = safe_parse(str(region['y_min']))
-            y_max = safe_parse(str(region['y_max']))
-            z_min = safe_parse(str(region['z_min']))
-            z_max = safe_parse(str(region['z_max']))
+        if not symbolic:
+            pass
+
+        elif region_type == 'box':
+            x_min = parse_bounds(region['x_min'])
+            x_max = parse_bounds(region['x_max'])
+            y_min = parse_bounds(region['y_min'])
+            y_max = parse_bounds(region['y_max'])
+            z_min = parse_bounds(region['z_min'])
+            z_max = parse_bounds(region['z_max'])
             symbolic_result = integrate(
                 integrand_expr, (z, z_min, z_max), (y, y_min, y_max), (x, x_min, x_max)
             )
 
         elif region_type == 'sphere':
             cx, cy, cz = region.get('center', [0, 0, 0])
-            radius = safe_parse(str(region['radius']))
-            spherical_integrand = integrand_expr.subs([
-                (x, cx + r * sin(phi) * cos(theta)),
-                (y, cy + r * sin(phi) * sin(theta)),
-                (z, cz + r * cos(phi))
-            ]) * r**2 * sin(phi)
+            radius = parse_bounds(region['radius'])
+            spherical_integrand = integrand_expr.xreplace({
+                x: cx + r * sin(phi) * cos(theta),
+                y: cy + r * sin(phi) * sin(theta),
+                z: cz + r * cos(phi),
+            }) * r**2 * sin(phi)
             symbolic_result = integrate(
                 spherical_integrand, (r, 0, radius), (phi, 0, pi), (theta, 0, 2 * pi)
             )
 
         elif region_type == 'cylinder':
             cx, cy = region.get('center', [0, 0])
-            radius = safe_parse(str(region['radius']))
-            z_min = safe_parse(str(region['z_min']))
-            z_max = safe_parse(str(region['z_max']))
-            cylindrical_integrand = integrand_expr.subs([
-                (x, cx + r * cos(theta)),
-                (y, cy + r * sin(theta))
-            ]) * r
+            radius = parse_bounds(region['radius'])
+            z_min = parse_bounds(region['z_min'])
+            z_max = parse_bounds(region['z_max'])
+            cylindrical_integrand = integrand_expr.xreplace({
+                x: cx + r * cos(theta),
+                y: cy + r * sin(theta),
+            }) * r
             symbolic_result = integrate(
                 cylindrical_integrand, (z, z_min, z_max), (r, 0, radius), (theta, 0, 2 * pi)
             )
@@ -65,23 +122,25 @@ def compute_integral_3d(integrand_expr, region: dict) -> Dict[str, Any]:
                 symbolic_value = float(N(symbolic_result))
             except Exception:
                 symbolic_value = None
+            simplified = simplify_output(symbolic_result)
             return {
-                'symbolic': str(simplify(symbolic_result)),
-                'symbolic_latex': latex(simplify(symbolic_result)),
+                'symbolic': str(simplified),
+                'symbolic_latex': latex(simplified),
                 'symbolic_value': symbolic_value,
                 'numerical': numerical_result['value'],
                 'error': numerical_result['error'],
             }
         else:
             return {
-                'symbolic': 'Symbolic integration not available',
+                'symbolic': ('Symbolic integration skipped' if not symbolic
+                             else 'Symbolic integration not available'),
                 'symbolic_latex': r'\text{N/A}',
                 'numerical': numerical_result['value'],
                 'error': numerical_result['error'],
             }
 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("3D integration failed")
         try:
             numerical_result = compute_numerical_3d(integrand_expr, region)
             return {
@@ -96,7 +155,34 @@ def compute_integral_3d(integrand_expr, region: dict) -> Dict[str, Any]:
 
 def compute_numerical_3d(integrand_expr, region: dict) -> Dict[str, float]:
     """Monte Carlo integration in 3D."""
-    f = lambdify((x, y, z), integrand_expr, modules=TORCH_MODULES)
+    try:
+        return _monte_carlo_3d(integrand_expr, region, _MC_DEVICE)
+    except Exception:
+        # Not every lambdified expression maps onto CUDA ops; retry on CPU
+        if _MC_DEVICE.type != 'cpu':
+            return _monte_carlo_3d(integrand_expr, region, torch.device('cpu'))
+        raise
+
+
+@lru_cache(maxsize=128)
+def _torch_integrand(integrand_expr):
+    """Torch-lambdified integrand, optionally fused with torch.compile.
+
+    The plain lambdified function dispatches one small kernel per sympy
+    op; torch.compile fuses the elementwise chain into a few kernels,
+    which pays off on GPU once the one-time compile cost is amortized.
+    """
+    f = lambdify_cached(integrand_expr, (x, y, z), 'torch', cse=True)
+    if Config.USE_TORCH_COMPILE:
+        try:
+            f = torch.compile(f, dynamic=False, mode='reduce-overhead')
+        except Exception:
+            logger.debug("torch.compile failed, using eager integrand", exc_info=True)
+    return f
+
+
+def _monte_carlo_3d(integrand_expr, region: dict, device) -> Dict[str, float]:
+    f = _torch_integrand(integrand_expr)
     region_type = region.get('type', 'box')
     n_samples = Config.MAX_MONTE_CARLO_SAMPLES
 
@@ -105,26 +191,28 @@ def compute_numerical_3d(integrand_expr, region: dict) -> Dict[str, float]:
         y_min, y_max = float(region['y_min']), float(region['y_max'])
         z_min, z_max = float(region['z_min']), float(region['z_max'])
         volume = (x_max - x_min) * (y_max - y_min) * (z_max - z_min)
-        xs = torch.rand(n_samples) * (x_max - x_min) + x_min
-        ys = torch.rand(n_samples) * (y_max - y_min) + y_min
-        zs = torch.rand(n_samples) * (z_max - z_min) + z_min
-        values = f(xs, ys, zs)
+
+        def transform(us):
+            xs = us[:, 0] * (x_max - x_min) + x_min
+            ys = us[:, 1] * (y_max - y_min) + y_min
+            zs = us[:, 2] * (z_max - z_min) + z_min
+            return xs, ys, zs
 
     elif region_type == 'sphere':
         cx, cy, cz = region.get('center', [0, 0, 0])
         radius = float(region['radius'])
         volume = (4 / 3) * math.pi * radius**3
 
-        # Direct spherical coordinate sampling (no rejection needed)
-        rs = radius * torch.rand(n_samples).pow(1.0 / 3.0)
-        cos_phi = torch.rand(n_samples) * 2 - 1
-        sin_phi = torch.sqrt(1 - cos_phi**2)
-        thetas = torch.rand(n_samples) * (2 * math.pi)
-
-        xs = cx + rs * sin_phi * torch.cos(thetas)
-        ys = cy + rs * sin_phi * torch.sin(thetas)
-        zs = cz + rs * cos_phi
-        values = f(xs, ys, zs)
+        def transform(us):
+            # Direct spherical coordinate sampling (no rejection needed)
+            rs = radius * us[:, 0].pow(1.0 / 3.0)
+            cos_phi = us[:, 1] * 2 - 1
+            sin_phi = torch.sqrt(1 - cos_phi**2)
+            thetas = us[:, 2] * (2 * math.pi)
+            xs = cx + rs * sin_phi * torch.cos(thetas)
+            ys = cy + rs * sin_phi * torch.sin(thetas)
+            zs = cz + rs * cos_phi
+            return xs, ys, zs
 
     elif region_type == 'cylinder':
         cx, cy = region.get('center', [0, 0])
@@ -132,23 +220,90 @@ def compute_numerical_3d(integrand_expr, region: dict) -> Dict[str, float]:
         z_min, z_max = float(region['z_min']), float(region['z_max'])
         volume = math.pi * radius**2 * (z_max - z_min)
 
-        rs = torch.sqrt(torch.rand(n_samples) * radius**2)
-        thetas = torch.rand(n_samples) * (2 * math.pi)
-        xs = cx + rs * torch.cos(thetas)
-        ys = cy + rs * torch.sin(thetas)
-        zs = torch.rand(n_samples) * (z_max - z_min) + z_min
-        values = f(xs, ys, zs)
+        def transform(us):
+            rs = torch.sqrt(us[:, 0] * radius**2)
+            thetas = us[:, 1] * (2 * math.pi)
+            xs = cx + rs * torch.cos(thetas)
+            ys = cy + rs * torch.sin(thetas)
+            zs = us[:, 2] * (z_max - z_min) + z_min
+            return xs, ys, zs
 
     else:
         raise ValueError(f"Unknown region type: {region_type}")
 
-    if not isinstance(values, torch.Tensor):
-        values = torch.tensor(values, dtype=torch.float64)
-    values = torch.nan_to_num(values, nan=0.0, posinf=1e10, neginf=-1e10)
-    mean_value = values.mean()
-    std_value = values.std()
+    use_sobol = Config.MC_METHOD == 'sobol'
+    if use_sobol:
+        # Independently scrambled replicates: within a replicate the points
+        # are not iid (that is the point of QMC), so the error estimate
+        # comes from the spread across replicates instead. Replicates are
+        # rounded up to a power of two — Sobol blocks are only balanced
+        # (and hit their QMC convergence rate) at 2^m points
+        batch_size = min(_MC_CHUNK, max(1, -(-n_samples // _SOBOL_REPLICATES)))
+        batch_size = 1 << (batch_size - 1).bit_length()
+        batch_sizes = [batch_size] * max(1, -(-n_samples // batch_size))
+    else:
+        batch_sizes = []
+        remaining = n_samples
+        while remaining > 0:
+            batch_sizes.append(min(_MC_CHUNK, remaining))
+            remaining -= batch_sizes[-1]
+
+    def uniform(n):
+        if use_sobol:
+            engine = torch.quasirandom.SobolEngine(dimension=3, scramble=True)
+            return engine.draw(n).to(device=device, dtype=_MC_DTYPE)
+        return torch.rand((n, 3), device=device, dtype=_MC_DTYPE)
+
+    # On CPU a compiled scalar kernel fuses evaluation, sanitizing and the
+    # reduction into one parallel pass with no tensor temporaries; the
+    # torch path remains for GPU devices and numba-unsupported expressions
+    f_kernel = None
+    if _HAS_NUMBA and device.type == 'cpu':
+        candidate = lambdify_cached(integrand_expr, (x, y, z), 'scalar', jit=True)
+        if hasattr(candidate, 'nopython_signatures'):
+            f_kernel = candidate
 
-    result = volume * float(mean_value)
-    error = volume * float(std_value) / math.sqrt(n_samples)
+    # Batch the samples so peak memory stays bounded regardless of
+    # n_samples, merging per-batch statistics with Welford/Chan updates.
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    batch_means = []
+    for n in batch_sizes:
+        if f_kernel is not None:
+            xs, ys, zs = transform(uniform(n))
+            total, total_sq = _mc_reduce(
+                np.ascontiguousarray(xs.numpy(), dtype=np.float64),
+                np.ascontiguousarray(ys.numpy(), dtype=np.float64),
+                np.ascontiguousarray(zs.numpy(), dtype=np.float64),
+                f_kernel,
+            )
+            batch_mean = total / n
+            batch_sq = total_sq / n
+        else:
+            values = f(*transform(uniform(n)))
+            if not isinstance(values, torch.Tensor):
+                values = torch.tensor(values, dtype=_MC_DTYPE)
+            values = torch.nan_to_num(values, nan=0.0, posinf=1e10, neginf=-1e10)
+
+            # Batch reductions accumulate in float64 without a full-size copy
+            batch_mean = float(values.mean(dtype=torch.float64))
+            batch_sq = float(values.square().mean(dtype=torch.float64))
+        batch_m2 = max(batch_sq - batch_mean * batch_mean, 0.0) * n
+
+        delta = batch_mean - mean
+        new_count = count + n
+        mean += delta * n / new_count
+        m2 += batch_m2 + delta * delta * count * n / new_count
+        count = new_count
+        batch_means.append(batch_mean)
+
+    if use_sobol and len(batch_means) > 1:
+        k = len(batch_means)
+        var_between = sum((bm - mean) ** 2 for bm in batch_means) / (k - 1)
+        error = volume * math.sqrt(var_between / k)
+    else:
+        std_value = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+        error = volume * std_value / math.sqrt(count)
 
-    return {'value': float(result), 'error': float(error)}
+    return {'value': float(volume * mean), 'error': float(error)}
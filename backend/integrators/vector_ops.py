@@ -2,30 +2,30 @@
 
 from __future__ import annotations
 
-from sympy import diff, simplify
+from sympy import derive_by_array, simplify
 
 from backend.parsers import x, y, z
 
 
 def compute_gradient_field(scalar_field) -> tuple:
     """Compute gradient of a scalar field: nabla f."""
-    grad_x = diff(scalar_field, x)
-    grad_y = diff(scalar_field, y)
-    grad_z = diff(scalar_field, z)
-    return (simplify(grad_x), simplify(grad_y), simplify(grad_z))
+    grad_x, grad_y, grad_z = derive_by_array(scalar_field, (x, y, z))
+    return (grad_x, grad_y, grad_z)
 
 
 def compute_divergence_field(vector_field: tuple):
     """Compute divergence of a vector field: nabla . F."""
-    Fx, Fy, Fz = vector_field
-    div = diff(Fx, x) + diff(Fy, y) + diff(Fz, z)
+    # Diagonal of the same single-pass Jacobian used for curl
+    J = derive_by_array(vector_field, (x, y, z))
+    div = J[0][0] + J[1][1] + J[2][2]
     return simplify(div)
 
 
 def compute_curl_field(vector_field: tuple) -> tuple:
     """Compute curl of a vector field: nabla x F."""
-    Fx, Fy, Fz = vector_field
-    curl_x = diff(Fz, y) - diff(Fy, z)
-    curl_y = diff(Fx, z) - diff(Fz, x)
-    curl_z = diff(Fy, x) - diff(Fx, y)
-    return (simplify(curl_x), simplify(curl_y), simplify(curl_z))
+    # One Jacobian pass; J[i][j] = d(F_j)/d(x_i)
+    J = derive_by_array(vector_field, (x, y, z))
+    curl_x = J[1][2] - J[2][1]
+    curl_y = J[2][0] - J[0][2]
+    curl_z = J[0][1] - J[1][0]
+    return (curl_x, curl_y, curl_z)
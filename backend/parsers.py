@@ -4,20 +4,23 @@ from __future__ import annotations
 
 import logging
 import math
+import re
 from functools import lru_cache
 from typing import Optional
 
 import torch
 
 from sympy import (
-    symbols, sqrt, pi, sin, cos, tan, exp, log, Abs,
-    oo, simplify, latex, parse_expr, Matrix, diff,
-    atan2, acos, asin, sinh, cosh, tanh, sec, csc, cot, N
+    symbols, sqrt, pi, sin, cos, tan, exp, log, Abs, cancel,
+    oo, simplify, latex, parse_expr, Matrix, diff, lambdify,
+    atan2, acos, asin, sinh, cosh, tanh, sec, csc, cot, N,
+    Integer, Float, Tuple
 )
 from sympy.parsing.sympy_parser import (
     parse_expr, standard_transformations,
     implicit_multiplication_application, convert_xor
 )
+from sympy.printing.pycode import pycode
 
 from backend.config import Config
 
@@ -47,6 +50,11 @@ BLOCKED_PATTERNS = [
     'os.', 'sys.', 'subprocess', 'lambda', 'class ', 'def ',
 ]
 
+# One compiled alternation scans the input in a single C-level pass
+# instead of one Python-level substring check per pattern; IGNORECASE
+# replaces the old lower-cased copy of the input
+_BLOCKED_RE = re.compile('|'.join(re.escape(p) for p in BLOCKED_PATTERNS), re.IGNORECASE)
+
 # Lambdify module mappings for PyTorch (vectorized tensor evaluation)
 TORCH_MODULES = [{
     'sin': torch.sin, 'cos': torch.cos, 'tan': torch.tan,
@@ -59,6 +67,95 @@ TORCH_MODULES = [{
 # Lambdify module mapping for scalar evaluation (scipy integration)
 SCALAR_MODULES = ['math']
 
+# Optional numba acceleration for scalar lambdified functions
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Module configs keyed by a short hashable tag, for the lambdify cache
+LAMBDIFY_MODULES = {
+    'scalar': SCALAR_MODULES,
+    'torch': TORCH_MODULES,
+    'numpy': ['numpy'],
+}
+
+
+@lru_cache(maxsize=512)
+def _cached_lambdify(expr, variables, module_key: str, jit: bool, cse: bool):
+    func = lambdify(variables, expr, modules=LAMBDIFY_MODULES[module_key], cse=cse)
+    if jit and _HAS_NUMBA:
+        try:
+            # Compile eagerly so unsupported expressions fall back right away
+            signature = numba.float64(*([numba.float64] * len(variables)))
+            func = numba.njit(signature)(func)
+        except Exception:
+            logger.debug("numba compilation failed, using plain lambdify", exc_info=True)
+    return func
+
+
+def lambdify_cached(expr, variables, modules: str = 'scalar', jit: bool = False,
+                    cse: bool = False):
+    """Lambdify with a module-level cache keyed on (expr, variables, modules).
+
+    SymPy expressions are immutable and hashable, so repeated requests with
+    the same expression skip code generation entirely. With ``jit=True`` the
+    scalar-module result is compiled with numba when available. ``cse=True``
+    folds repeated subterms (common after parametric substitution) into
+    local temporaries in the generated code.
+    """
+    return _cached_lambdify(expr, tuple(variables), modules, jit and modules == 'scalar', cse)
+
+
+@lru_cache(maxsize=512)
+def _fast_scalar_lambdify(expr, variables):
+    code = pycode(expr)
+    if '\n' in code or 'Not supported' in code:
+        return None
+    src = f"def _f({', '.join(str(v) for v in variables)}): return {code}"
+    namespace = {}
+    exec(compile(src, '<fast_scalar_lambdify>', 'exec'), {'math': math}, namespace)
+    return namespace['_f']
+
+
+def fast_scalar_lambdify(expr, variables):
+    """Build a scalar callable by printing and compiling the expression directly.
+
+    Skips lambdify's namespace assembly and printer dispatch — for the
+    scalar quad path the generated function is a one-line ``math``-module
+    expression. Returns None when the expression uses something pycode
+    cannot print, so callers can fall back to ``lambdify_cached``.
+    """
+    try:
+        return _fast_scalar_lambdify(expr, tuple(variables))
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def diff_cached(expr, var):
+    """Differentiate with a cache keyed on (expr, var).
+
+    The frontend re-sends the same curves and surfaces constantly, so the
+    parametric derivatives the integrators need usually already exist.
+    """
+    return diff(expr, var)
+
+
+def simplify_output(expr):
+    """Normalize an expression for display.
+
+    ``simplify`` is sympy's most expensive normalizer; with
+    ``SIMPLIFY_OUTPUT`` disabled the much cheaper ``cancel`` is used.
+    """
+    if Config.SIMPLIFY_OUTPUT:
+        return simplify(expr)
+    try:
+        return cancel(expr)
+    except Exception:
+        return expr
+
 
 def validate_expression(expr_str: str) -> str:
     """Check length and blocked patterns."""
@@ -76,24 +173,16 @@ def validate_expression(expr_str: str) -> str:
             f"Maximum is {Config.MAX_EXPRESSION_LENGTH}."
         )
 
-    lowered = expr_str.lower()
-    for pattern in BLOCKED_PATTERNS:
-        if pattern in lowered:
-            raise ValueError(f"Expression contains blocked pattern: {pattern}")
+    match = _BLOCKED_RE.search(expr_str)
+    if match:
+        raise ValueError(f"Expression contains blocked pattern: {match.group(0).lower()}")
 
     return expr_str
 
 
-def safe_parse(expr_str: str):
-    """Parse a math expression string into a sympy expr."""
-    expr_str = validate_expression(str(expr_str))
-
+@lru_cache(maxsize=4096)
+def _cached_parse(expr_str: str):
     try:
-        # Replace common notation
-        expr_str = expr_str.replace('^', '**')
-        expr_str = expr_str.replace('\u03c0', 'pi')  # π
-        expr_str = expr_str.replace('\u221e', 'oo')   # ∞
-
         return parse_expr(
             expr_str,
             local_dict=SAFE_LOCAL_DICT,
@@ -103,17 +192,68 @@ def safe_parse(expr_str: str):
         raise ValueError(f"Could not parse expression: {expr_str}. Error: {str(e)}")
 
 
+def safe_parse(expr_str: str):
+    """Parse a math expression string into a sympy expr.
+
+    Parsing is cached on the normalized string: sympy's tokenizer and
+    transformation pipeline dominate request time for the small bound
+    expressions ('0', 'pi', '2*pi', ...) the frontend re-sends constantly.
+    """
+    expr_str = validate_expression(str(expr_str))
+
+    # Replace common notation
+    expr_str = expr_str.replace('^', '**')
+    expr_str = expr_str.replace('\u03c0', 'pi')  # π
+    expr_str = expr_str.replace('\u221e', 'oo')   # ∞
+
+    return _cached_parse(expr_str)
+
+
 def parse_vector_field(field_dict: dict) -> tuple:
     """Parse {x, y, z} string components into sympy exprs."""
     if not isinstance(field_dict, dict):
         raise ValueError("Vector field must be a dict with 'x', 'y', 'z' components")
 
-    fx = safe_parse(field_dict.get('x', '0'))
-    fy = safe_parse(field_dict.get('y', '0'))
-    fz = safe_parse(field_dict.get('z', '0'))
-    return (fx, fy, fz)
+    fx_str = str(field_dict.get('x', '0'))
+    fy_str = str(field_dict.get('y', '0'))
+    fz_str = str(field_dict.get('z', '0'))
+
+    # One tokenizer pass over all three components; anything that breaks
+    # the composed tuple form falls back to parsing per component, which
+    # also attributes errors to the right field
+    try:
+        combined = safe_parse(f"(({fx_str}), ({fy_str}), ({fz_str}))")
+        if isinstance(combined, (tuple, Tuple)) and len(combined) == 3:
+            return tuple(combined)
+    except Exception:
+        pass
+
+    return (safe_parse(fx_str), safe_parse(fy_str), safe_parse(fz_str))
 
 
 def parse_bounds(value) -> object:
-    """Parse a bound value (could be string or number)."""
-    return safe_parse(str(value))
+    """Parse a bound value (could be string or number).
+
+    Numeric inputs skip the tokenizer: msgpack/JSON bounds usually arrive
+    as plain numbers, and round-tripping them through parse_expr is the
+    expensive path.
+    """
+    if isinstance(value, bool):
+        raise ValueError("Bound must be a number or expression string")
+    if isinstance(value, int):
+        return Integer(value)
+    if isinstance(value, float):
+        return Float(value)
+
+    # Numeric strings ('3', '-0.5') are the common case for bounds typed
+    # into the UI; convert directly rather than tokenizing them
+    s = str(value).strip()
+    try:
+        return Integer(int(s))
+    except ValueError:
+        pass
+    try:
+        return Float(float(s))
+    except (ValueError, OverflowError):
+        pass
+    return safe_parse(s)
@@ -0,0 +1,47 @@
+"""Binary packing helpers for visualization payloads."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def pack_f32(arr, lengths: list | None = None) -> dict:
+    """Pack an array as a raw little-endian float32 msgpack bin blob.
+
+    The client rebuilds the array from `shape` with a Float32Array view;
+    `lengths` optionally records valid prefixes along the first axis for
+    ragged data (field lines).
+    """
+    if hasattr(arr, 'detach'):  # torch tensor, without importing torch here
+        arr = arr.detach().cpu().numpy()
+    arr = np.ascontiguousarray(arr, dtype=np.float32)
+    packed = {'dtype': 'f32', 'shape': list(arr.shape), 'data': arr.tobytes()}
+    if lengths is not None:
+        packed['lengths'] = lengths
+    return packed
+
+
+def arrows_soa(origins=None, directions=None) -> dict:
+    """Pack arrow origins/directions as six flat per-axis lists.
+
+    A structure-of-arrays layout: one contiguous list per axis instead of
+    a dict with two 3-lists per arrow, so the encoder writes six arrays
+    rather than allocating a dict and two lists per arrow. Call with no
+    arguments for an empty payload.
+    """
+    if origins is None:
+        origins = directions = np.empty((0, 3))
+    if hasattr(origins, 'detach'):
+        origins = origins.detach().cpu().numpy()
+    if hasattr(directions, 'detach'):
+        directions = directions.detach().cpu().numpy()
+    origins = np.asarray(origins).reshape(-1, 3)
+    directions = np.asarray(directions).reshape(-1, 3)
+    return {
+        'origin_x': origins[:, 0].tolist(),
+        'origin_y': origins[:, 1].tolist(),
+        'origin_z': origins[:, 2].tolist(),
+        'dir_x': directions[:, 0].tolist(),
+        'dir_y': directions[:, 1].tolist(),
+        'dir_z': directions[:, 2].tolist(),
+    }
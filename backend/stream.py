@@ -0,0 +1,114 @@
+"""Field-line tracing kernels."""
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+    from numba import types
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    # The kernel is typed against a generic scalar-field function type, not
+    # the concrete compiled components, so one cached specialization serves
+    # every vector field. cache=True persists the compilation on disk
+    # (NUMBA_CACHE_DIR), so restarts skip first-request compile latency too.
+    _scalar3 = types.FunctionType(
+        types.float64(types.float64, types.float64, types.float64)
+    )
+    _trace_sig = types.Tuple((types.float64[:, :, ::1], types.int64[::1]))(
+        types.float64[:, ::1], types.float64[::1], types.float64, types.int64,
+        _scalar3, _scalar3, _scalar3,
+    )
+
+    @numba.njit(_trace_sig, cache=True)
+    def _trace_lines(starts, box, step_size, steps, Fx, Fy, Fz):
+        """Euler-step all field lines inside one compiled kernel."""
+        n_starts = starts.shape[0]
+        # zeros, not empty: the padded tail beyond each line's length is serialized
+        positions = np.zeros((n_starts, steps + 1, 3))
+        lengths = np.empty(n_starts, dtype=np.int64)
+        for i in range(n_starts):
+            px, py, pz = starts[i, 0], starts[i, 1], starts[i, 2]
+            positions[i, 0, 0] = px
+            positions[i, 0, 1] = py
+            positions[i, 0, 2] = pz
+            length = 1
+            for _ in range(steps):
+                fx = Fx(px, py, pz)
+                fy = Fy(px, py, pz)
+                fz = Fz(px, py, pz)
+                mag = math.sqrt(fx * fx + fy * fy + fz * fz)
+                if mag < 1e-10 or not math.isfinite(mag):
+                    break
+                px += step_size * fx / mag
+                py += step_size * fy / mag
+                pz += step_size * fz / mag
+                if not (box[0] <= px <= box[1] and box[2] <= py <= box[3] and box[4] <= pz <= box[5]):
+                    break
+                positions[i, length, 0] = px
+                positions[i, length, 1] = py
+                positions[i, length, 2] = pz
+                length += 1
+            lengths[i] = length
+        return positions, lengths
+
+
+def _trace_lines_python(start_points, region, step_size, steps, Fx_func, Fy_func, Fz_func):
+    """Pure-Python field-line tracer, used when numba is unavailable."""
+    field_lines = []
+    for start in start_points:
+        line = [list(start)]
+        pos = [float(start[0]), float(start[1]), float(start[2])]
+        for _ in range(steps):
+            try:
+                fx = float(Fx_func(pos[0], pos[1], pos[2]))
+                fy = float(Fy_func(pos[0], pos[1], pos[2]))
+                fz = float(Fz_func(pos[0], pos[1], pos[2]))
+                mag = math.sqrt(fx**2 + fy**2 + fz**2)
+                if mag < 1e-10 or not math.isfinite(mag):
+                    break
+                pos = [
+                    pos[0] + step_size * fx / mag,
+                    pos[1] + step_size * fy / mag,
+                    pos[2] + step_size * fz / mag,
+                ]
+                if not (float(region['x_min']) <= pos[0] <= float(region['x_max']) and
+                        float(region['y_min']) <= pos[1] <= float(region['y_max']) and
+                        float(region['z_min']) <= pos[2] <= float(region['z_max'])):
+                    break
+                line.append(list(pos))
+            except Exception:
+                break
+        field_lines.append(line)
+    return field_lines
+
+
+def trace_field_lines(start_points, region, step_size, steps, funcs):
+    """Trace field lines from each start point, staying inside the region box.
+
+    Returns ``(positions, lengths)`` where positions is a zero-padded
+    ``(n_lines, steps+1, 3)`` array and lengths holds each line's valid
+    prefix. Uses the compiled kernel when all three component functions
+    were njit-compiled, otherwise falls back to the Python tracer.
+    """
+    compiled = _HAS_NUMBA and all(hasattr(f, 'nopython_signatures') for f in funcs)
+    if compiled and start_points:
+        starts = np.asarray(start_points, dtype=np.float64).reshape(-1, 3)
+        box = np.array([
+            float(region['x_min']), float(region['x_max']),
+            float(region['y_min']), float(region['y_max']),
+            float(region['z_min']), float(region['z_max']),
+        ])
+        return _trace_lines(starts, box, float(step_size), int(steps), *funcs)
+
+    traced = _trace_lines_python(start_points, region, step_size, steps, *funcs)
+    lengths = np.array([len(line) for line in traced], dtype=np.int64)
+    max_len = int(lengths.max()) if traced else 0
+    positions = np.zeros((len(traced), max_len, 3))
+    for i, line in enumerate(traced):
+        positions[i, :len(line)] = line
+    return positions, lengths
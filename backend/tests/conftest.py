@@ -7,27 +7,39 @@ import pytest
 # Ensure backend is importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-import msgpack
+import msgspec
 from starlette.testclient import TestClient
 
 from backend.app import app as fastapi_app
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def client():
-    """Synchronous test client using Starlette's TestClient."""
+    """Synchronous test client using Starlette's TestClient.
+
+    Session-scoped: one app startup/shutdown (and one worker pool) for
+    the whole suite instead of per test. Endpoints keep no per-request
+    mutable state beyond the module-level rate limiter, which is shared
+    across clients either way.
+    """
     with TestClient(fastapi_app) as c:
         yield c
 
 
+# Reused encoder/decoder — msgspec is what the app itself speaks, and
+# reusing instances avoids per-call setup across the whole suite
+_ENC = msgspec.msgpack.Encoder()
+_DEC = msgspec.msgpack.Decoder()
+
+
 def msgpack_post(client, url, data):
     """Helper to POST msgpack-encoded data and decode the response."""
-    body = msgpack.packb(data, use_bin_type=True)
+    body = _ENC.encode(data)
     response = client.post(url, content=body, headers={'Content-Type': 'application/x-msgpack'})
-    return response, msgpack.unpackb(response.content, raw=False)
+    return response, _DEC.decode(response.content)
 
 
 def msgpack_get(client, url):
     """Helper to GET and decode a msgpack response."""
     response = client.get(url)
-    return response, msgpack.unpackb(response.content, raw=False)
+    return response, _DEC.decode(response.content)
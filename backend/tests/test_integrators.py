@@ -101,5 +101,5 @@ class TestVectorOperations:
         vf = (x*y, y*z, z*x)
         curl = compute_curl_field(vf)
         div_curl = compute_divergence_field(curl)
-        from sympy import simplify
-        assert simplify(div_curl) == 0
+        from sympy import expand
+        assert expand(div_curl) == 0
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import math
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Any
 
-from sympy import integrate, simplify, latex, N, lambdify, diff, pi
+import numpy as np
+from sympy import integrate, simplify, expand, trigsimp, latex, N, lambdify, pi, sin, cos, Integral
 from scipy import integrate as scipy_integrate
 
-from backend.parsers import x, y, z, t, safe_parse, parse_vector_field, SCALAR_MODULES
+from backend.parsers import (
+    x, y, z, t, safe_parse, parse_vector_field, parse_bounds,
+    lambdify_cached, diff_cached, SCALAR_MODULES,
+)
+from backend.integrators._jit import quad_callable
+from backend.integrators.quadrature import adaptive_gk21
 from backend.integrators.line import compute_line_integral_vector
 from backend.integrators.surface import compute_flux_integral
 from backend.integrators.triple import compute_integral_3d
@@ -17,24 +26,49 @@ from backend.visualizers.vectors import generate_line_integral_visualization
 from backend.visualizers.surfaces import generate_surface_integral_visualization
 
 
+# Cached printers and simplifier (same pattern as backend.app, which the
+# import direction keeps us from sharing): exprs are hashable, so the
+# canned demo inputs short-circuit the recursive tree walks entirely
+_simplify = lru_cache(maxsize=2048)(simplify)
+_latex = lru_cache(maxsize=2048)(latex)
+_str = lru_cache(maxsize=2048)(str)
+
+
+@lru_cache(maxsize=2048)
+def _light_simplify(expr):
+    """expand + trigsimp: enough to canonicalize a closed-form integral
+    for display without simplify's full strategy search."""
+    return trigsimp(expand(expr))
+
+# The two sides of each theorem are independent; one of them runs here
+# while the calling thread computes the other. scipy/numpy release the
+# GIL in their inner loops, so the overlap is real. The verify functions
+# stay synchronous because app._run dispatches them to worker processes
+_FANOUT = ThreadPoolExecutor(max_workers=2, thread_name_prefix='verify-fanout')
+
+# Documented defaults, parsed once at import — the common "just show me
+# the example" request never touches the parser
+_DEFAULT_P = safe_parse('-y/2')
+_DEFAULT_Q = safe_parse('x/2')
+_DEFAULT_GREENS_CURVE = {'x': 'cos(t)', 'y': 'sin(t)'}
+
+
 def verify_greens_theorem(data: dict) -> Dict[str, Any]:
     """Verify Green's Theorem: oint_C (P dx + Q dy) = iint_D (dQ/dx - dP/dy) dA."""
-    P_str = data.get('P', '-y/2')
-    Q_str = data.get('Q', 'x/2')
-    curve = data.get('curve', {'x': 'cos(t)', 'y': 'sin(t)'})
+    curve = data.get('curve', _DEFAULT_GREENS_CURVE)
     t_start = data.get('t_start', 0)
     t_end = data.get('t_end', '2*pi')
 
-    P = safe_parse(P_str)
-    Q = safe_parse(Q_str)
+    P = safe_parse(data['P']) if 'P' in data else _DEFAULT_P
+    Q = safe_parse(data['Q']) if 'Q' in data else _DEFAULT_Q
 
     x_t = safe_parse(curve.get('x', 'cos(t)'))
     y_t = safe_parse(curve.get('y', 'sin(t)'))
-    t_start_val = safe_parse(str(t_start))
-    t_end_val = safe_parse(str(t_end))
+    t_start_val = parse_bounds(t_start)
+    t_end_val = parse_bounds(t_end)
 
-    dx_dt = diff(x_t, t)
-    dy_dt = diff(y_t, t)
+    dx_dt = diff_cached(x_t, t)
+    dy_dt = diff_cached(y_t, t)
 
     P_on_curve = P.subs([(x, x_t), (y, y_t)])
     Q_on_curve = Q.subs([(x, x_t), (y, y_t)])
@@ -42,15 +76,21 @@ def verify_greens_theorem(data: dict) -> Dict[str, Any]:
     line_integrand = P_on_curve * dx_dt + Q_on_curve * dy_dt
     line_integral_symbolic = integrate(line_integrand, (t, t_start_val, t_end_val))
 
-    f_line = lambdify(t, line_integrand, modules=SCALAR_MODULES)
-    line_integral_numerical, line_error = scipy_integrate.quad(
-        f_line, float(N(t_start_val)), float(N(t_end_val))
-    )
-
-    dQ_dx = diff(Q, x)
-    dP_dy = diff(P, y)
+    if line_integral_symbolic.is_number and not line_integral_symbolic.has(Integral):
+        # Closed form already in hand — evaluating it beats re-deriving
+        # the same number with adaptive quadrature
+        line_integral_numerical = float(N(line_integral_symbolic))
+        line_error = 0.0
+    else:
+        line_integral_numerical, line_error = _quad_line_integrand(
+            line_integrand, float(N(t_start_val)), float(N(t_end_val)),
+            f_np=_composed_line_integrand(P, Q, x_t, y_t, dx_dt, dy_dt),
+        )
+
+    dQ_dx = diff_cached(Q, x)
+    dP_dy = diff_cached(P, y)
     curl_z = dQ_dx - dP_dy
-    curl_z_simplified = simplify(curl_z)
+    curl_z_simplified = _simplify(curl_z)
 
     curve_viz = generate_line_integral_visualization(
         {'x': curve.get('x'), 'y': curve.get('y'), 'z': '0'},
@@ -59,20 +99,87 @@ def verify_greens_theorem(data: dict) -> Dict[str, Any]:
 
     return {
         'theorem': "Green's Theorem",
-        'P': str(P),
-        'Q': str(Q),
+        'P': _str(P),
+        'Q': _str(Q),
         'line_integral': {
-            'symbolic': str(simplify(line_integral_symbolic)),
+            'symbolic': _str(_simplify(line_integral_symbolic)
+                             if data.get('deep_simplify')
+                             else _light_simplify(line_integral_symbolic)),
             'numerical': float(line_integral_numerical),
             'error': float(line_error),
         },
-        'curl_z': str(curl_z_simplified),
-        'curl_z_latex': latex(curl_z_simplified),
+        'curl_z': _str(curl_z_simplified),
+        'curl_z_latex': _latex(curl_z_simplified),
         'description': "oint(P dx + Q dy) = iint(dQ/dx - dP/dy) dA",
         'visualization': curve_viz,
     }
 
 
+def _composed_line_integrand(P, Q, x_t, y_t, dx_dt, dy_dt):
+    """Numeric Green's line integrand composed from separately lambdified parts.
+
+    Lambdifying P(x, y), Q(x, y) and the curve pieces on their own and
+    composing numerically bypasses the substituted expression tree for
+    the quadrature loop — each part is tiny and usually already sitting
+    in the lambdify cache from a previous request.
+    """
+    P_f = lambdify_cached(P, (x, y), 'numpy', cse=True)
+    Q_f = lambdify_cached(Q, (x, y), 'numpy', cse=True)
+    x_f = lambdify_cached(x_t, (t,), 'numpy', cse=True)
+    y_f = lambdify_cached(y_t, (t,), 'numpy', cse=True)
+    dx_f = lambdify_cached(dx_dt, (t,), 'numpy', cse=True)
+    dy_f = lambdify_cached(dy_dt, (t,), 'numpy', cse=True)
+
+    def f_line(ts):
+        xs, ys = x_f(ts), y_f(ts)
+        return P_f(xs, ys) * dx_f(ts) + Q_f(xs, ys) * dy_f(ts)
+
+    return f_line
+
+
+def _quad_line_integrand(line_integrand, a: float, b: float, f_np=None) -> tuple:
+    """Integrate a line integrand over [a, b] with the cheapest adequate rule.
+
+    Closed curves give smooth periodic integrands, for which the
+    trapezoidal rule converges exponentially — adaptive QUADPACK with its
+    error machinery is overkill. Non-periodic integrands get the
+    vectorized adaptive Gauss-Kronrod driver, which evaluates a whole
+    subinterval per call; anything that fails falls back to quad.
+    """
+    try:
+        span = b - a
+        cycles = span / (2 * math.pi)
+        periodic = (
+            line_integrand.has(sin, cos)
+            and cycles > 0
+            and abs(cycles - round(cycles)) < 1e-9
+        )
+        if f_np is None:
+            f_np = lambdify_cached(line_integrand, (t,), 'numpy', cse=True)
+        with np.errstate(all='ignore'):
+            if periodic:
+                ts = np.linspace(a, b, 257)
+                vals = np.broadcast_to(np.asarray(f_np(ts), dtype=float), ts.shape)
+                if np.all(np.isfinite(vals)):
+                    return float(np.trapezoid(vals, ts)), 0.0
+            else:
+                value, gk_error = adaptive_gk21(
+                    lambda ts: np.broadcast_to(
+                        np.asarray(f_np(ts), dtype=float), np.shape(ts)
+                    ), a, b
+                )
+                if math.isfinite(value):
+                    return float(value), float(gk_error)
+    except Exception:
+        pass
+
+    # Compiled LowLevelCallable when numba is available: QUADPACK then
+    # samples the integrand without a Python round-trip per abscissa
+    f_line = (quad_callable(line_integrand, (t,))
+              or lambdify_cached(line_integrand, (t,), 'scalar', cse=True))
+    return scipy_integrate.quad(f_line, a, b)
+
+
 def verify_stokes_theorem(data: dict) -> Dict[str, Any]:
     """Verify Stokes' Theorem: oint_C F . dr = iint_S (nabla x F) . dS."""
     vector_field_dict = data.get('vector_field', {'x': '-y', 'y': 'x', 'z': '0'})
@@ -84,9 +191,12 @@ def verify_stokes_theorem(data: dict) -> Dict[str, Any]:
     t_end = data.get('t_end', '2*pi')
 
     vector_field = parse_vector_field(vector_field_dict)
-    line_result = compute_line_integral_vector(vector_field, curve, t_start, t_end)
     curl_F = compute_curl_field(vector_field)
+    line_future = _FANOUT.submit(
+        compute_line_integral_vector, vector_field, curve, t_start, t_end
+    )
     flux_result = compute_flux_integral(curl_F, surface, u_range, v_range)
+    line_result = line_future.result()
 
     curve_viz = generate_line_integral_visualization(curve, t_start, t_end, vector_field)
     surface_viz = generate_surface_integral_visualization(surface, u_range, v_range)
@@ -94,7 +204,7 @@ def verify_stokes_theorem(data: dict) -> Dict[str, Any]:
     return {
         'theorem': "Stokes' Theorem",
         'vector_field': vector_field_dict,
-        'curl_F': {'x': str(curl_F[0]), 'y': str(curl_F[1]), 'z': str(curl_F[2])},
+        'curl_F': {'x': _str(curl_F[0]), 'y': _str(curl_F[1]), 'z': _str(curl_F[2])},
         'line_integral': line_result,
         'surface_integral': flux_result,
         'verification': {
@@ -116,17 +226,20 @@ def verify_divergence_theorem(data: dict) -> Dict[str, Any]:
     v_range = data.get('v_range', [0, '2*pi'])
 
     vector_field = parse_vector_field(vector_field_dict)
-    flux_result = compute_flux_integral(vector_field, surface, u_range, v_range)
+    flux_future = _FANOUT.submit(
+        compute_flux_integral, vector_field, surface, u_range, v_range
+    )
     div_F = compute_divergence_field(vector_field)
     volume_result = compute_integral_3d(div_F, volume_region)
+    flux_result = flux_future.result()
 
     surface_viz = generate_surface_integral_visualization(surface, u_range, v_range, vector_field)
 
     return {
         'theorem': 'Divergence Theorem',
         'vector_field': vector_field_dict,
-        'divergence': str(div_F),
-        'divergence_latex': latex(div_F),
+        'divergence': _str(div_F),
+        'divergence_latex': _latex(div_F),
         'flux_integral': flux_result,
         'volume_integral': volume_result,
         'verification': {
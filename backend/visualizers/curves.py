@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import torch
-from sympy import lambdify
+import numpy as np
 
-from backend.parsers import x, SCALAR_MODULES
+from backend.parsers import x, lambdify_cached
 
 
 def generate_1d_visualization_data(
@@ -13,26 +12,31 @@ def generate_1d_visualization_data(
 ) -> dict:
     """Generate data for 1D integration visualization (area under curve)."""
     try:
-        f = lambdify(x, integrand_expr, modules=SCALAR_MODULES)
-        x_vals = torch.linspace(float(a), float(b), num_points)
-        y_vals = torch.tensor([float(f(float(xi))) for xi in x_vals])
-        y_vals = torch.nan_to_num(y_vals, nan=0.0, posinf=1e10, neginf=-1e10)
-
-        rect_width = (float(b) - float(a)) / num_rectangles
-        rectangles = []
-        for i in range(num_rectangles):
-            rect_x = float(a) + i * rect_width
-            rect_height = float(f(rect_x + rect_width / 2))
-            rectangles.append({
-                'x': rect_x,
-                'width': rect_width,
-                'height': rect_height,
-            })
+        f = lambdify_cached(integrand_expr, (x,), 'numpy')
+        a_f, b_f = float(a), float(b)
+
+        # float32 throughout: the samples exist to be plotted at screen
+        # resolution, and half the bytes walk through pack/encode later
+        x_vals = np.linspace(a_f, b_f, num_points, dtype=np.float32)
+        with np.errstate(all='ignore'):
+            y_vals = np.broadcast_to(np.asarray(f(x_vals), dtype=np.float32), x_vals.shape)
+        y_vals = np.nan_to_num(y_vals, nan=0.0, posinf=1e10, neginf=-1e10)
+
+        rect_width = (b_f - a_f) / num_rectangles
+        mids = np.linspace(a_f + rect_width / 2, b_f - rect_width / 2,
+                           num_rectangles, dtype=np.float32)
+        with np.errstate(all='ignore'):
+            heights = np.broadcast_to(np.asarray(f(mids), dtype=np.float32), mids.shape)
+        heights = np.nan_to_num(heights, nan=0.0, posinf=1e10, neginf=-1e10)
+        rectangles = [
+            {'x': mid - rect_width / 2, 'width': rect_width, 'height': height}
+            for mid, height in zip(mids.tolist(), heights.tolist())
+        ]
 
         return {
             'curve': {'x': x_vals.tolist(), 'y': y_vals.tolist()},
             'rectangles': rectangles,
-            'bounds': {'a': float(a), 'b': float(b)},
+            'bounds': {'a': a_f, 'b': b_f},
         }
     except Exception as e:
         raise ValueError(f"Error generating 1D visualization: {str(e)}")
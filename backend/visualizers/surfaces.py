@@ -5,99 +5,85 @@ from __future__ import annotations
 import math
 import traceback
 import torch
-from sympy import lambdify, diff, Matrix, N
+from sympy import N
 
-from backend.parsers import x, y, z, u, v, safe_parse, TORCH_MODULES, SCALAR_MODULES
+from backend.parsers import x, y, z, u, v, safe_parse, lambdify_cached
+from backend.serialization import arrows_soa, pack_f32
+
+# Elementwise grid math dispatches to CUDA kernels when a GPU is present
+_DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+# Shared 0-d sentinel so the hot masking path never allocates one per call
+_NAN = torch.tensor(float('nan'), dtype=torch.float32, device=_DEVICE)
 
 
 def generate_2d_visualization_data(integrand_expr, region: dict, num_points: int = 50) -> dict:
     """Generate data for 2D integration visualization (volume under surface)."""
     try:
-        f = lambdify((x, y), integrand_expr, modules=TORCH_MODULES)
+        f = lambdify_cached(integrand_expr, (x, y), 'torch')
         region_type = region.get('type', 'rectangle')
 
         if region_type == 'rectangle':
             x_min, x_max = float(region['x_min']), float(region['x_max'])
             y_min, y_max = float(region['y_min']), float(region['y_max'])
-            x_vals = torch.linspace(x_min, x_max, num_points)
-            y_vals = torch.linspace(y_min, y_max, num_points)
+            x_vals = torch.linspace(x_min, x_max, num_points, dtype=torch.float32, device=_DEVICE)
+            y_vals = torch.linspace(y_min, y_max, num_points, dtype=torch.float32, device=_DEVICE)
             X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
             Z = f(X, Y)
             if not isinstance(Z, torch.Tensor):
                 Z = torch.full_like(X, float(Z))
-            mask = torch.ones_like(Z, dtype=torch.bool)
+            mask = None
 
         elif region_type == 'disk':
             cx, cy = region.get('center', [0, 0])
             radius = float(region['radius'])
-            x_vals = torch.linspace(cx - radius, cx + radius, num_points)
-            y_vals = torch.linspace(cy - radius, cy + radius, num_points)
+            x_vals = torch.linspace(cx - radius, cx + radius, num_points, dtype=torch.float32, device=_DEVICE)
+            y_vals = torch.linspace(cy - radius, cy + radius, num_points, dtype=torch.float32, device=_DEVICE)
             X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
             Z = f(X, Y)
             if not isinstance(Z, torch.Tensor):
                 Z = torch.full_like(X, float(Z))
             mask = (X - cx)**2 + (Y - cy)**2 <= radius**2
-            Z = torch.where(mask, Z, torch.tensor(float('nan')))
 
         elif region_type == 'type_1':
             x_min, x_max = float(region['x_min']), float(region['x_max'])
-            y_lower_expr = safe_parse(region['y_lower'])
-            y_upper_expr = safe_parse(region['y_upper'])
-            y_lower_func = lambdify(x, y_lower_expr, modules=TORCH_MODULES)
-            y_upper_func = lambdify(x, y_upper_expr, modules=TORCH_MODULES)
-            x_test = torch.linspace(x_min, x_max, 100)
-            y_lowers = y_lower_func(x_test)
-            y_uppers = y_upper_func(x_test)
-            if not isinstance(y_lowers, torch.Tensor):
-                y_lowers = torch.full_like(x_test, float(y_lowers))
-            if not isinstance(y_uppers, torch.Tensor):
-                y_uppers = torch.full_like(x_test, float(y_uppers))
-            y_min_val = float(y_lowers.min())
-            y_max_val = float(y_uppers.max())
-            x_vals = torch.linspace(x_min, x_max, num_points)
-            y_vals = torch.linspace(y_min_val, y_max_val, num_points)
+            x_vals = torch.linspace(x_min, x_max, num_points, dtype=torch.float32, device=_DEVICE)
+            # One bound evaluation along the x axis serves both the grid
+            # range and the mask; the separate 100-point pre-scan and the
+            # full-grid bound passes are gone
+            y_lowers = _eval_edge(safe_parse(region['y_lower']), x, x_vals)
+            y_uppers = _eval_edge(safe_parse(region['y_upper']), x, x_vals)
+            if region.get('y_min') is not None and region.get('y_max') is not None:
+                y_min_val, y_max_val = float(region['y_min']), float(region['y_max'])
+            else:
+                y_min_val = float(y_lowers.min())
+                y_max_val = float(y_uppers.max())
+            y_vals = torch.linspace(y_min_val, y_max_val, num_points, dtype=torch.float32, device=_DEVICE)
             X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
             Z = f(X, Y)
             if not isinstance(Z, torch.Tensor):
                 Z = torch.full_like(X, float(Z))
-            Y_lower = y_lower_func(X)
-            Y_upper = y_upper_func(X)
-            if not isinstance(Y_lower, torch.Tensor):
-                Y_lower = torch.full_like(X, float(Y_lower))
-            if not isinstance(Y_upper, torch.Tensor):
-                Y_upper = torch.full_like(X, float(Y_upper))
-            mask = (Y >= Y_lower) & (Y <= Y_upper)
-            Z = torch.where(mask, Z, torch.tensor(float('nan')))
+            # 'xy' indexing puts x along dim 1, so the 1-D bounds
+            # broadcast as rows against Y
+            mask = (Y >= y_lowers.unsqueeze(0)) & (Y <= y_uppers.unsqueeze(0))
 
         elif region_type == 'type_2':
             y_min, y_max = float(region['y_min']), float(region['y_max'])
-            x_lower_expr = safe_parse(region['x_lower'])
-            x_upper_expr = safe_parse(region['x_upper'])
-            x_lower_func = lambdify(y, x_lower_expr, modules=TORCH_MODULES)
-            x_upper_func = lambdify(y, x_upper_expr, modules=TORCH_MODULES)
-            y_test = torch.linspace(y_min, y_max, 100)
-            x_lowers = x_lower_func(y_test)
-            x_uppers = x_upper_func(y_test)
-            if not isinstance(x_lowers, torch.Tensor):
-                x_lowers = torch.full_like(y_test, float(x_lowers))
-            if not isinstance(x_uppers, torch.Tensor):
-                x_uppers = torch.full_like(y_test, float(x_uppers))
-            x_min_val = float(x_lowers.min())
-            x_max_val = float(x_uppers.max())
-            x_vals = torch.linspace(x_min_val, x_max_val, num_points)
-            y_vals = torch.linspace(y_min, y_max, num_points)
+            y_vals = torch.linspace(y_min, y_max, num_points, dtype=torch.float32, device=_DEVICE)
+            x_lowers = _eval_edge(safe_parse(region['x_lower']), y, y_vals)
+            x_uppers = _eval_edge(safe_parse(region['x_upper']), y, y_vals)
+            if region.get('x_min') is not None and region.get('x_max') is not None:
+                x_min_val, x_max_val = float(region['x_min']), float(region['x_max'])
+            else:
+                x_min_val = float(x_lowers.min())
+                x_max_val = float(x_uppers.max())
+            x_vals = torch.linspace(x_min_val, x_max_val, num_points, dtype=torch.float32, device=_DEVICE)
             X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
             Z = f(X, Y)
             if not isinstance(Z, torch.Tensor):
                 Z = torch.full_like(X, float(Z))
-            X_lower = x_lower_func(Y)
-            X_upper = x_upper_func(Y)
-            if not isinstance(X_lower, torch.Tensor):
-                X_lower = torch.full_like(Y, float(X_lower))
-            if not isinstance(X_upper, torch.Tensor):
-                X_upper = torch.full_like(Y, float(X_upper))
-            mask = (X >= X_lower) & (X <= X_upper)
-            Z = torch.where(mask, Z, torch.tensor(float('nan')))
+            # y runs along dim 0, so these bounds broadcast as columns
+            mask = (X >= x_lowers.unsqueeze(1)) & (X <= x_uppers.unsqueeze(1))
 
         elif region_type == 'inequality':
             condition_str = region['condition']
@@ -105,37 +91,41 @@ def generate_2d_visualization_data(integrand_expr, region: dict, num_points: int
             x_max = float(region.get('x_max', 5))
             y_min = float(region.get('y_min', -5))
             y_max = float(region.get('y_max', 5))
-            x_vals = torch.linspace(x_min, x_max, num_points)
-            y_vals = torch.linspace(y_min, y_max, num_points)
+            x_vals = torch.linspace(x_min, x_max, num_points, dtype=torch.float32, device=_DEVICE)
+            y_vals = torch.linspace(y_min, y_max, num_points, dtype=torch.float32, device=_DEVICE)
             X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
             Z = f(X, Y)
             if not isinstance(Z, torch.Tensor):
                 Z = torch.full_like(X, float(Z))
+            # One lambda over left - right (with cse for shared subterms)
+            # instead of two separate grid evaluations
             if '<=' in condition_str:
-                parts = condition_str.split('<=')
-                left = safe_parse(parts[0])
-                right = safe_parse(parts[1])
-                left_func = lambdify((x, y), left, modules=TORCH_MODULES)
-                right_func = lambdify((x, y), right, modules=TORCH_MODULES)
-                mask = left_func(X, Y) <= right_func(X, Y)
+                op = '<='
             elif '>=' in condition_str:
-                parts = condition_str.split('>=')
-                left = safe_parse(parts[0])
-                right = safe_parse(parts[1])
-                left_func = lambdify((x, y), left, modules=TORCH_MODULES)
-                right_func = lambdify((x, y), right, modules=TORCH_MODULES)
-                mask = left_func(X, Y) >= right_func(X, Y)
+                op = '>='
+            else:
+                op = None
+            if op is not None:
+                parts = condition_str.split(op)
+                diff_expr = safe_parse(parts[0]) - safe_parse(parts[1])
+                d = lambdify_cached(diff_expr, (x, y), 'torch', cse=True)(X, Y)
+                if not isinstance(d, torch.Tensor):
+                    d = torch.full_like(X, float(d))
+                mask = d <= 0 if op == '<=' else d >= 0
             else:
-                mask = torch.ones_like(Z, dtype=torch.bool)
-            Z = torch.where(mask, Z, torch.tensor(float('nan')))
+                mask = None
         else:
             raise ValueError(f"Unknown region type: {region_type}")
 
-        Z = torch.nan_to_num(Z, nan=float('nan'), posinf=1e10, neginf=-1e10)
+        # Single fused sanitize pass: clamp infinities in-region, NaN out
+        Z = Z.clamp(-1e10, 1e10)
+        if mask is not None:
+            Z = torch.where(mask, Z, _NAN)
         boundary_points = generate_region_boundary(region, num_points=100)
 
         return {
-            'surface': {'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist()},
+            # Grids go out as packed float32 blobs, not nested float lists
+            'surface': {'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z)},
             'boundary': boundary_points,
             'region_type': region_type,
         }
@@ -158,100 +148,187 @@ def generate_region_boundary(region: dict, num_points: int = 100) -> dict:
     elif region_type == 'disk':
         cx, cy = region.get('center', [0, 0])
         radius = float(region['radius'])
-        theta_vals = torch.linspace(0, 2 * math.pi, num_points)
+        theta_vals = torch.linspace(0, 2 * math.pi, num_points, dtype=torch.float32, device=_DEVICE)
         return {
-            'x': (cx + radius * torch.cos(theta_vals)).tolist(),
-            'y': (cy + radius * torch.sin(theta_vals)).tolist(),
+            'x': (cx + radius * torch.cos(theta_vals)).cpu().tolist(),
+            'y': (cy + radius * torch.sin(theta_vals)).cpu().tolist(),
         }
     elif region_type == 'type_1':
         x_min, x_max = float(region['x_min']), float(region['x_max'])
-        y_lower_func = lambdify(x, safe_parse(region['y_lower']), modules=SCALAR_MODULES)
-        y_upper_func = lambdify(x, safe_parse(region['y_upper']), modules=SCALAR_MODULES)
-        x_vals = torch.linspace(x_min, x_max, num_points // 2)
-        lower_y = torch.tensor([float(y_lower_func(float(xi))) for xi in x_vals])
-        upper_y = torch.tensor([float(y_upper_func(float(xi))) for xi in x_vals])
+        x_vals = torch.linspace(x_min, x_max, num_points // 2, dtype=torch.float32, device=_DEVICE)
+        lower_y = _eval_edge(safe_parse(region['y_lower']), x, x_vals)
+        upper_y = _eval_edge(safe_parse(region['y_upper']), x, x_vals)
         boundary_x = torch.cat([x_vals, x_vals.flip(0), x_vals[:1]])
         boundary_y = torch.cat([lower_y, upper_y.flip(0), lower_y[:1]])
-        return {'x': boundary_x.tolist(), 'y': boundary_y.tolist()}
+        return {'x': boundary_x.cpu().tolist(), 'y': boundary_y.cpu().tolist()}
     elif region_type == 'type_2':
         y_min, y_max = float(region['y_min']), float(region['y_max'])
-        x_lower_func = lambdify(y, safe_parse(region['x_lower']), modules=SCALAR_MODULES)
-        x_upper_func = lambdify(y, safe_parse(region['x_upper']), modules=SCALAR_MODULES)
-        y_vals = torch.linspace(y_min, y_max, num_points // 2)
-        lower_x = torch.tensor([float(x_lower_func(float(yi))) for yi in y_vals])
-        upper_x = torch.tensor([float(x_upper_func(float(yi))) for yi in y_vals])
+        y_vals = torch.linspace(y_min, y_max, num_points // 2, dtype=torch.float32, device=_DEVICE)
+        lower_x = _eval_edge(safe_parse(region['x_lower']), y, y_vals)
+        upper_x = _eval_edge(safe_parse(region['x_upper']), y, y_vals)
         boundary_x = torch.cat([lower_x, upper_x.flip(0), lower_x[:1]])
         boundary_y = torch.cat([y_vals, y_vals.flip(0), y_vals[:1]])
-        return {'x': boundary_x.tolist(), 'y': boundary_y.tolist()}
+        return {'x': boundary_x.cpu().tolist(), 'y': boundary_y.cpu().tolist()}
     return {'x': [], 'y': []}
 
 
+def _eval_edge(expr, var, vals):
+    """Evaluate a 1-variable bound expression over a tensor in one call.
+
+    Constants broadcast via full_like; a scalar fallback keeps edge cases
+    (expressions the torch mapping cannot handle) working per point.
+    """
+    try:
+        W = lambdify_cached(expr, (var,), 'torch')(vals)
+        if not isinstance(W, torch.Tensor):
+            W = torch.full_like(vals, float(W))
+        return W
+    except Exception:
+        f_s = lambdify_cached(expr, (var,), 'scalar', jit=True)
+        return torch.tensor([float(f_s(vi)) for vi in vals.cpu().tolist()],
+                            dtype=vals.dtype, device=vals.device)
+
+
+def _evaluate_on_grid(integrand_expr, f_scalar, X, Y, Z):
+    """Evaluate the integrand over a coordinate grid in one tensor call.
+
+    Falls back to the scalar lambda per point only when the torch mapping
+    cannot evaluate the expression.
+    """
+    try:
+        f_t = lambdify_cached(integrand_expr, (x, y, z), 'torch')
+        V = f_t(X, Y, Z)
+        if not isinstance(V, torch.Tensor):
+            V = torch.full_like(X, float(V))
+        return V
+    except Exception:
+        return torch.tensor([
+            float(f_scalar(xi, yi, zi))
+            for xi, yi, zi in zip(X.reshape(-1).cpu().tolist(),
+                                  Y.reshape(-1).cpu().tolist(),
+                                  Z.reshape(-1).cpu().tolist())
+        ], dtype=X.dtype, device=X.device)
+
+
+def _eval_uv(expr_uv, U, V_grid):
+    """Evaluate a (u, v) expression over a parameter grid in one tensor call.
+
+    Constants broadcast via full_like; expressions the torch mapping
+    cannot handle fall back to a scalar lambda per grid point.
+    """
+    try:
+        W = lambdify_cached(expr_uv, (u, v), 'torch')(U, V_grid)
+        if not isinstance(W, torch.Tensor):
+            W = torch.full_like(U, float(W))
+        return W
+    except Exception:
+        f_s = lambdify_cached(expr_uv, (u, v), 'scalar', jit=True)
+        vals = [float(f_s(ui, vi))
+                for ui, vi in zip(U.reshape(-1).cpu().tolist(), V_grid.reshape(-1).cpu().tolist())]
+        return torch.tensor(vals, dtype=U.dtype, device=U.device).reshape(U.shape)
+
+
+def _eval_uv3(exprs, U, V_grid):
+    """Evaluate three (u, v) expressions jointly over a parameter grid.
+
+    A single cse=True lambda computes subexpressions shared between the
+    components (the trig factors of a cross product, for instance) once
+    per grid instead of once per component.
+    """
+    try:
+        outs = lambdify_cached(exprs, (u, v), 'torch', cse=True)(U, V_grid)
+        return tuple(
+            W if isinstance(W, torch.Tensor) else torch.full_like(U, float(W))
+            for W in outs
+        )
+    except Exception:
+        return tuple(_eval_uv(e, U, V_grid) for e in exprs)
+
+
+def _eval_xyz3(exprs, X, Y, Z):
+    """Evaluate three (x, y, z) expressions jointly over coordinate tensors.
+
+    The (x, y, z) counterpart of _eval_uv3: one cse=True lambda for all
+    three vector-field components instead of a lambda per component.
+    """
+    try:
+        outs = lambdify_cached(exprs, (x, y, z), 'torch', cse=True)(X, Y, Z)
+        return tuple(
+            W if isinstance(W, torch.Tensor) else torch.full_like(X, float(W))
+            for W in outs
+        )
+    except Exception:
+        return tuple(
+            _evaluate_on_grid(
+                e, lambdify_cached(e, (x, y, z), 'scalar', jit=True), X, Y, Z
+            ).reshape(X.shape)
+            for e in exprs
+        )
+
+
 def generate_3d_visualization_data(integrand_expr, region: dict, num_points: int = 25) -> dict:
     """Generate data for 3D integration visualization."""
     try:
-        f = lambdify((x, y, z), integrand_expr, modules=SCALAR_MODULES)
+        f = lambdify_cached(integrand_expr, (x, y, z), 'scalar', jit=True)
         region_type = region.get('type', 'box')
 
         if region_type == 'box':
             x_min, x_max = float(region['x_min']), float(region['x_max'])
             y_min, y_max = float(region['y_min']), float(region['y_max'])
             z_min, z_max = float(region['z_min']), float(region['z_max'])
-            x_vals = torch.linspace(x_min, x_max, num_points)
-            y_vals = torch.linspace(y_min, y_max, num_points)
-            z_vals = torch.linspace(z_min, z_max, num_points)
-            points = []
-            values = []
-            for xi in x_vals:
-                for yi in y_vals:
-                    for zi in z_vals:
-                        points.append([float(xi), float(yi), float(zi)])
-                        values.append(float(f(float(xi), float(yi), float(zi))))
+            x_vals = torch.linspace(x_min, x_max, num_points, dtype=torch.float32, device=_DEVICE)
+            y_vals = torch.linspace(y_min, y_max, num_points, dtype=torch.float32, device=_DEVICE)
+            z_vals = torch.linspace(z_min, z_max, num_points, dtype=torch.float32, device=_DEVICE)
+            # One vectorized evaluation over the full grid instead of
+            # num_points**3 scalar lambda calls; 'ij' keeps the same
+            # x-outermost point ordering the loops produced
+            X, Y, Z = torch.meshgrid(x_vals, y_vals, z_vals, indexing='ij')
+            V = _evaluate_on_grid(integrand_expr, f, X, Y, Z)
+            points = torch.stack([X, Y, Z], dim=-1).reshape(-1, 3).cpu().tolist()
+            values = V.reshape(-1)
             surfaces = generate_box_surfaces(x_min, x_max, y_min, y_max, z_min, z_max)
 
         elif region_type == 'sphere':
             cx, cy, cz = region.get('center', [0, 0, 0])
             radius = float(region['radius'])
-            phi_vals = torch.linspace(0, math.pi, num_points)
-            theta_vals = torch.linspace(0, 2 * math.pi, num_points)
-            r_vals = torch.linspace(0, radius, num_points // 2)
-            points = []
-            values = []
-            for ri in r_vals:
-                for phi_i in phi_vals[::2]:
-                    for theta_i in theta_vals[::2]:
-                        xi = float(cx + ri * math.sin(float(phi_i)) * math.cos(float(theta_i)))
-                        yi = float(cy + ri * math.sin(float(phi_i)) * math.sin(float(theta_i)))
-                        zi = float(cz + ri * math.cos(float(phi_i)))
-                        points.append([xi, yi, zi])
-                        values.append(float(f(xi, yi, zi)))
+            phi_vals = torch.linspace(0, math.pi, num_points, dtype=torch.float32, device=_DEVICE)
+            theta_vals = torch.linspace(0, 2 * math.pi, num_points, dtype=torch.float32, device=_DEVICE)
+            r_vals = torch.linspace(0, radius, num_points // 2, dtype=torch.float32, device=_DEVICE)
+            # Broadcasted coordinate math over the (r, phi, theta) grid,
+            # keeping the loops' strided phi/theta sampling and ordering
+            R, P, T = torch.meshgrid(r_vals, phi_vals[::2], theta_vals[::2], indexing='ij')
+            sin_P = torch.sin(P)
+            Xg = cx + R * sin_P * torch.cos(T)
+            Yg = cy + R * sin_P * torch.sin(T)
+            Zg = cz + R * torch.cos(P)
+            V = _evaluate_on_grid(integrand_expr, f, Xg, Yg, Zg)
+            points = torch.stack([Xg, Yg, Zg], dim=-1).reshape(-1, 3).cpu().tolist()
+            values = V.reshape(-1)
             surfaces = generate_sphere_surface(cx, cy, cz, radius)
 
         elif region_type == 'cylinder':
             cx, cy = region.get('center', [0, 0])
             radius = float(region['radius'])
             z_min, z_max = float(region['z_min']), float(region['z_max'])
-            theta_vals = torch.linspace(0, 2 * math.pi, num_points)
-            r_vals = torch.linspace(0, radius, num_points // 2)
-            z_vals = torch.linspace(z_min, z_max, num_points // 2)
-            points = []
-            values = []
-            for ri in r_vals:
-                for theta_i in theta_vals[::2]:
-                    for zi in z_vals:
-                        xi = float(cx + ri * math.cos(float(theta_i)))
-                        yi = float(cy + ri * math.sin(float(theta_i)))
-                        points.append([xi, yi, float(zi)])
-                        values.append(float(f(xi, yi, float(zi))))
+            theta_vals = torch.linspace(0, 2 * math.pi, num_points, dtype=torch.float32, device=_DEVICE)
+            r_vals = torch.linspace(0, radius, num_points // 2, dtype=torch.float32, device=_DEVICE)
+            z_vals = torch.linspace(z_min, z_max, num_points // 2, dtype=torch.float32, device=_DEVICE)
+            R, T, Zg = torch.meshgrid(r_vals, theta_vals[::2], z_vals, indexing='ij')
+            Xg = cx + R * torch.cos(T)
+            Yg = cy + R * torch.sin(T)
+            V = _evaluate_on_grid(integrand_expr, f, Xg, Yg, Zg)
+            points = torch.stack([Xg, Yg, Zg], dim=-1).reshape(-1, 3).cpu().tolist()
+            values = V.reshape(-1)
             surfaces = generate_cylinder_surface(cx, cy, radius, z_min, z_max)
         else:
             raise ValueError(f"Unknown 3D region type: {region_type}")
 
-        values_tensor = torch.tensor(values)
+        values_tensor = values if isinstance(values, torch.Tensor) else torch.tensor(values)
         values_tensor = torch.nan_to_num(values_tensor, nan=0.0, posinf=1e10, neginf=-1e10)
 
         return {
             'points': points,
-            'values': values_tensor.tolist(),
+            'values': values_tensor.cpu().tolist(),
             'surfaces': surfaces,
             'region_type': region_type,
         }
@@ -262,60 +339,64 @@ def generate_3d_visualization_data(integrand_expr, region: dict, num_points: int
 
 def generate_box_surfaces(x_min, x_max, y_min, y_max, z_min, z_max, n: int = 20) -> list:
     """Generate surface mesh data for a box."""
-    surfaces = []
-    x_vals = torch.linspace(x_min, x_max, n)
-    y_vals = torch.linspace(y_min, y_max, n)
-    z_vals = torch.linspace(z_min, z_max, n)
-
-    X, Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
-    Z = torch.full_like(X, z_max)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'front'})
-    Z = torch.full_like(X, z_min)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'back'})
-
-    X, Z = torch.meshgrid(x_vals, z_vals, indexing='xy')
-    Y = torch.full_like(X, y_max)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'top'})
-    Y = torch.full_like(X, y_min)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'bottom'})
-
-    Y, Z = torch.meshgrid(y_vals, z_vals, indexing='xy')
-    X = torch.full_like(Y, x_max)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'right'})
-    X = torch.full_like(Y, x_min)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'left'})
-    return surfaces
+    x_vals = torch.linspace(x_min, x_max, n, dtype=torch.float32, device=_DEVICE)
+    y_vals = torch.linspace(y_min, y_max, n, dtype=torch.float32, device=_DEVICE)
+    z_vals = torch.linspace(z_min, z_max, n, dtype=torch.float32, device=_DEVICE)
+
+    # Three meshes serve both opposing faces, and the constant planes are
+    # zero-copy expanded views (pack_f32 materializes them on serialize)
+    XY_X, XY_Y = torch.meshgrid(x_vals, y_vals, indexing='xy')
+    XZ_X, XZ_Z = torch.meshgrid(x_vals, z_vals, indexing='xy')
+    YZ_Y, YZ_Z = torch.meshgrid(y_vals, z_vals, indexing='xy')
+
+    def plane(val):
+        return torch.full((1, 1), float(val), dtype=torch.float32, device=_DEVICE).expand(n, n)
+
+    return [
+        {'x': pack_f32(XY_X), 'y': pack_f32(XY_Y), 'z': pack_f32(plane(z_max)), 'name': 'front'},
+        {'x': pack_f32(XY_X), 'y': pack_f32(XY_Y), 'z': pack_f32(plane(z_min)), 'name': 'back'},
+        {'x': pack_f32(XZ_X), 'y': pack_f32(plane(y_max)), 'z': pack_f32(XZ_Z), 'name': 'top'},
+        {'x': pack_f32(XZ_X), 'y': pack_f32(plane(y_min)), 'z': pack_f32(XZ_Z), 'name': 'bottom'},
+        {'x': pack_f32(plane(x_max)), 'y': pack_f32(YZ_Y), 'z': pack_f32(YZ_Z), 'name': 'right'},
+        {'x': pack_f32(plane(x_min)), 'y': pack_f32(YZ_Y), 'z': pack_f32(YZ_Z), 'name': 'left'},
+    ]
 
 
 def generate_sphere_surface(cx, cy, cz, radius, n: int = 30) -> list:
     """Generate surface mesh data for a sphere."""
-    phi_arr = torch.linspace(0, math.pi, n)
-    theta_arr = torch.linspace(0, 2 * math.pi, n)
+    phi_arr = torch.linspace(0, math.pi, n, dtype=torch.float32, device=_DEVICE)
+    theta_arr = torch.linspace(0, 2 * math.pi, n, dtype=torch.float32, device=_DEVICE)
     PHI, THETA = torch.meshgrid(phi_arr, theta_arr, indexing='xy')
-    X = cx + radius * torch.sin(PHI) * torch.cos(THETA)
-    Y = cy + radius * torch.sin(PHI) * torch.sin(THETA)
+    # Each transcendental once per grid; sin(PHI) is shared by X and Y
+    sin_phi = torch.sin(PHI)
+    X = cx + radius * sin_phi * torch.cos(THETA)
+    Y = cy + radius * sin_phi * torch.sin(THETA)
     Z = cz + radius * torch.cos(PHI)
-    return [{'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'sphere'}]
+    return [{'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z), 'name': 'sphere'}]
 
 
 def generate_cylinder_surface(cx, cy, radius, z_min, z_max, n: int = 30) -> list:
     """Generate surface mesh data for a cylinder."""
     surfaces = []
-    theta_arr = torch.linspace(0, 2 * math.pi, n)
-    z_arr = torch.linspace(z_min, z_max, n)
-    THETA, Z = torch.meshgrid(theta_arr, z_arr, indexing='xy')
-    X = cx + radius * torch.cos(THETA)
-    Y = cy + radius * torch.sin(THETA)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'lateral'})
-
-    r_arr = torch.linspace(0, radius, n // 2)
-    R, THETA2 = torch.meshgrid(r_arr, theta_arr, indexing='xy')
-    X = cx + R * torch.cos(THETA2)
-    Y = cy + R * torch.sin(THETA2)
-    Z = torch.full_like(X, z_max)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'top'})
-    Z = torch.full_like(X, z_min)
-    surfaces.append({'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist(), 'name': 'bottom'})
+    theta_arr = torch.linspace(0, 2 * math.pi, n, dtype=torch.float32, device=_DEVICE)
+    z_arr = torch.linspace(z_min, z_max, n, dtype=torch.float32, device=_DEVICE)
+    # sin/cos over the 1-D theta array once, broadcast into the lateral
+    # sheet and both caps instead of re-evaluating per 2-D grid
+    cos_t = torch.cos(theta_arr)
+    sin_t = torch.sin(theta_arr)
+
+    X = (cx + radius * cos_t).unsqueeze(0).expand(n, n)
+    Y = (cy + radius * sin_t).unsqueeze(0).expand(n, n)
+    Z = z_arr.unsqueeze(1).expand(n, n)
+    surfaces.append({'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z), 'name': 'lateral'})
+
+    r_arr = torch.linspace(0, radius, n // 2, dtype=torch.float32, device=_DEVICE)
+    X = cx + torch.outer(cos_t, r_arr)
+    Y = cy + torch.outer(sin_t, r_arr)
+    Z = torch.full((1, 1), float(z_max), dtype=torch.float32, device=_DEVICE).expand_as(X)
+    surfaces.append({'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z), 'name': 'top'})
+    Z = torch.full((1, 1), float(z_min), dtype=torch.float32, device=_DEVICE).expand_as(X)
+    surfaces.append({'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z), 'name': 'bottom'})
     return surfaces
 
 
@@ -329,27 +410,19 @@ def generate_surface_integral_visualization(
         y_uv = safe_parse(surface.get('y', 'v'))
         z_uv = safe_parse(surface.get('z', '0'))
 
-        x_func = lambdify((u, v), x_uv, modules=SCALAR_MODULES)
-        y_func = lambdify((u, v), y_uv, modules=SCALAR_MODULES)
-        z_func = lambdify((u, v), z_uv, modules=SCALAR_MODULES)
-
         u_start = float(N(safe_parse(str(u_range[0]))))
         u_end = float(N(safe_parse(str(u_range[1]))))
         v_start = float(N(safe_parse(str(v_range[0]))))
         v_end = float(N(safe_parse(str(v_range[1]))))
 
-        u_vals = torch.linspace(u_start, u_end, num_points)
-        v_vals = torch.linspace(v_start, v_end, num_points)
+        u_vals = torch.linspace(u_start, u_end, num_points, dtype=torch.float32, device=_DEVICE)
+        v_vals = torch.linspace(v_start, v_end, num_points, dtype=torch.float32, device=_DEVICE)
 
-        # Evaluate surface point by point for scalar lambdify
-        X = torch.zeros(num_points, num_points)
-        Y = torch.zeros(num_points, num_points)
-        Z = torch.zeros(num_points, num_points)
-        for i, ui in enumerate(u_vals):
-            for j, vi in enumerate(v_vals):
-                X[j, i] = float(x_func(float(ui), float(vi)))
-                Y[j, i] = float(y_func(float(ui), float(vi)))
-                Z[j, i] = float(z_func(float(ui), float(vi)))
+        # One joint vectorized call for all three coordinates over the
+        # (u, v) grid; 'xy' matches the X[j, i] = x(u_i, v_j) layout the
+        # loops built
+        U, Vg = torch.meshgrid(u_vals, v_vals, indexing='xy')
+        X, Y, Z = _eval_uv3((x_uv, y_uv, z_uv), U, Vg)
 
         X = torch.nan_to_num(X, nan=0.0, posinf=1e10, neginf=-1e10)
         Y = torch.nan_to_num(Y, nan=0.0, posinf=1e10, neginf=-1e10)
@@ -359,55 +432,36 @@ def generate_surface_integral_visualization(
         r_u = SymMatrix([sym_diff(x_uv, u), sym_diff(y_uv, u), sym_diff(z_uv, u)])
         r_v = SymMatrix([sym_diff(x_uv, v), sym_diff(y_uv, v), sym_diff(z_uv, v)])
         normal = r_u.cross(r_v)
-        normal_funcs = [lambdify((u, v), normal[i], modules=SCALAR_MODULES) for i in range(3)]
-
-        normals = []
-        arrow_u = torch.linspace(u_start, u_end, 8)
-        arrow_v = torch.linspace(v_start, v_end, 8)
-        for ui in arrow_u:
-            for vi in arrow_v:
-                try:
-                    xi = float(x_func(float(ui), float(vi)))
-                    yi = float(y_func(float(ui), float(vi)))
-                    zi = float(z_func(float(ui), float(vi)))
-                    nx = float(normal_funcs[0](float(ui), float(vi)))
-                    ny = float(normal_funcs[1](float(ui), float(vi)))
-                    nz = float(normal_funcs[2](float(ui), float(vi)))
-                    mag = math.sqrt(nx**2 + ny**2 + nz**2)
-                    if mag > 1e-10 and all(math.isfinite(val) for val in [xi, yi, zi, nx, ny, nz]):
-                        normals.append({
-                            'origin': [xi, yi, zi],
-                            'direction': [nx / mag, ny / mag, nz / mag],
-                        })
-                except Exception:
-                    pass
-
-        field_arrows = []
+
+        # Arrow grid: batch-evaluate origins and normal components, then
+        # mask out non-finite and degenerate normals in one pass
+        arrow_u = torch.linspace(u_start, u_end, 8, dtype=torch.float32, device=_DEVICE)
+        arrow_v = torch.linspace(v_start, v_end, 8, dtype=torch.float32, device=_DEVICE)
+        AU, AV = torch.meshgrid(arrow_u, arrow_v, indexing='ij')
+        ax, ay, az = _eval_uv3((x_uv, y_uv, z_uv), AU, AV)
+        origins = torch.stack([ax, ay, az], dim=-1).reshape(-1, 3)
+
+        dirs = torch.stack(
+            list(_eval_uv3(tuple(normal), AU, AV)), dim=-1
+        ).reshape(-1, 3)
+        mags = torch.linalg.norm(dirs, dim=-1, keepdim=True)
+        valid = (
+            torch.isfinite(origins).all(dim=-1)
+            & torch.isfinite(dirs).all(dim=-1)
+            & (mags.squeeze(-1) > 1e-10)
+        )
+        normals = arrows_soa(origins[valid], (dirs / mags)[valid])
+
+        field_arrows = arrows_soa()
         if vector_field:
-            from backend.parsers import x as sym_x, y as sym_y, z as sym_z
-            Fx, Fy, Fz = vector_field
-            Fx_func = lambdify((sym_x, sym_y, sym_z), Fx, modules=SCALAR_MODULES)
-            Fy_func = lambdify((sym_x, sym_y, sym_z), Fy, modules=SCALAR_MODULES)
-            Fz_func = lambdify((sym_x, sym_y, sym_z), Fz, modules=SCALAR_MODULES)
-            for ui in arrow_u:
-                for vi in arrow_v:
-                    try:
-                        xi = float(x_func(float(ui), float(vi)))
-                        yi = float(y_func(float(ui), float(vi)))
-                        zi = float(z_func(float(ui), float(vi)))
-                        fx = float(Fx_func(xi, yi, zi))
-                        fy = float(Fy_func(xi, yi, zi))
-                        fz = float(Fz_func(xi, yi, zi))
-                        if all(math.isfinite(val) for val in [fx, fy, fz]):
-                            field_arrows.append({
-                                'origin': [xi, yi, zi],
-                                'direction': [fx, fy, fz],
-                            })
-                    except Exception:
-                        pass
+            field = torch.stack(
+                list(_eval_xyz3(tuple(vector_field), ax, ay, az)), dim=-1
+            ).reshape(-1, 3)
+            field_valid = torch.isfinite(field).all(dim=-1)
+            field_arrows = arrows_soa(origins[field_valid], field[field_valid])
 
         return {
-            'surface': {'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist()},
+            'surface': {'x': pack_f32(X), 'y': pack_f32(Y), 'z': pack_f32(Z)},
             'normals': normals,
             'field_arrows': field_arrows,
             'u_range': [u_start, u_end],
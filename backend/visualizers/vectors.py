@@ -2,21 +2,44 @@
 
 from __future__ import annotations
 
-import math
 import traceback
 import torch
-from sympy import lambdify, N
+from sympy import N
 
-from backend.parsers import x, y, z, t, safe_parse, SCALAR_MODULES
+from backend.parsers import x, y, z, t, safe_parse, lambdify_cached
+from backend.serialization import arrows_soa
+
+_DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def _eval_field(F_expr, X, Y, Z):
+    """Evaluate one field component over coordinate tensors in one call.
+
+    Points where the scalar fallback raises become NaN so callers can
+    drop them with a finite mask, matching the old per-point skip.
+    """
+    try:
+        W = lambdify_cached(F_expr, (x, y, z), 'torch')(X, Y, Z)
+        if not isinstance(W, torch.Tensor):
+            W = torch.full_like(X, float(W))
+        return W
+    except Exception:
+        f_scalar = lambdify_cached(F_expr, (x, y, z), 'scalar', jit=True)
+        vals = []
+        for xi, yi, zi in zip(X.reshape(-1).cpu().tolist(),
+                              Y.reshape(-1).cpu().tolist(),
+                              Z.reshape(-1).cpu().tolist()):
+            try:
+                vals.append(float(f_scalar(xi, yi, zi)))
+            except Exception:
+                vals.append(float('nan'))
+        return torch.tensor(vals, dtype=X.dtype, device=X.device).reshape(X.shape)
 
 
 def generate_vector_field_visualization(vector_field: tuple, region: dict, num_points: int = 8) -> dict:
     """Generate 3D vector field arrows for visualization."""
     try:
         Fx, Fy, Fz = vector_field
-        Fx_func = lambdify((x, y, z), Fx, modules=SCALAR_MODULES)
-        Fy_func = lambdify((x, y, z), Fy, modules=SCALAR_MODULES)
-        Fz_func = lambdify((x, y, z), Fz, modules=SCALAR_MODULES)
 
         x_min = float(region.get('x_min', -2))
         x_max = float(region.get('x_max', 2))
@@ -25,25 +48,20 @@ def generate_vector_field_visualization(vector_field: tuple, region: dict, num_p
         z_min = float(region.get('z_min', -2))
         z_max = float(region.get('z_max', 2))
 
-        x_vals = torch.linspace(x_min, x_max, num_points)
-        y_vals = torch.linspace(y_min, y_max, num_points)
-        z_vals = torch.linspace(z_min, z_max, num_points)
-
-        arrows = []
-        for xi in x_vals:
-            for yi in y_vals:
-                for zi in z_vals:
-                    try:
-                        fx = float(Fx_func(float(xi), float(yi), float(zi)))
-                        fy = float(Fy_func(float(xi), float(yi), float(zi)))
-                        fz = float(Fz_func(float(xi), float(yi), float(zi)))
-                        if all(math.isfinite(val) for val in [fx, fy, fz]):
-                            arrows.append({
-                                'origin': [float(xi), float(yi), float(zi)],
-                                'direction': [fx, fy, fz],
-                            })
-                    except Exception:
-                        pass
+        x_vals = torch.linspace(x_min, x_max, num_points, dtype=torch.float32, device=_DEVICE)
+        y_vals = torch.linspace(y_min, y_max, num_points, dtype=torch.float32, device=_DEVICE)
+        z_vals = torch.linspace(z_min, z_max, num_points, dtype=torch.float32, device=_DEVICE)
+
+        # One vectorized evaluation per component over the full grid;
+        # points where a scalar fallback raises become NaN and are
+        # dropped by the finite mask, matching the old per-point skip
+        X, Y, Z = torch.meshgrid(x_vals, y_vals, z_vals, indexing='ij')
+        components = [_eval_field(F_expr, X, Y, Z) for F_expr in (Fx, Fy, Fz)]
+
+        origins = torch.stack([X, Y, Z], dim=-1).reshape(-1, 3)
+        field = torch.stack(components, dim=-1).reshape(-1, 3)
+        mask = torch.isfinite(field).all(dim=-1)
+        arrows = arrows_soa(origins[mask], field[mask])
 
         return {'arrows': arrows, 'region': region}
     except Exception as e:
@@ -63,41 +81,38 @@ def generate_line_integral_visualization(
         t_start_val = float(N(safe_parse(str(t_start))))
         t_end_val = float(N(safe_parse(str(t_end))))
 
-        x_func = lambdify(t, x_t, modules=SCALAR_MODULES)
-        y_func = lambdify(t, y_t, modules=SCALAR_MODULES)
-        z_func = lambdify(t, z_t, modules=SCALAR_MODULES)
-
-        t_vals = torch.linspace(t_start_val, t_end_val, num_points)
-        curve_points = {
-            'x': [float(x_func(float(ti))) for ti in t_vals],
-            'y': [float(y_func(float(ti))) for ti in t_vals],
-            'z': [float(z_func(float(ti))) for ti in t_vals],
-        }
-
-        arrows = []
+        t_vals = torch.linspace(t_start_val, t_end_val, num_points, dtype=torch.float32, device=_DEVICE)
+
+        # Whole-tensor curve evaluation: one call per axis instead of
+        # num_points scalar lambda calls
+        def eval_curve(expr_t):
+            try:
+                W = lambdify_cached(expr_t, (t,), 'torch')(t_vals)
+                if not isinstance(W, torch.Tensor):
+                    W = torch.full_like(t_vals, float(W))
+                return W
+            except Exception:
+                f_s = lambdify_cached(expr_t, (t,), 'scalar', jit=True)
+                return torch.tensor([float(f_s(ti)) for ti in t_vals.cpu().tolist()],
+                                    dtype=t_vals.dtype, device=t_vals.device)
+
+        xs = eval_curve(x_t)
+        ys = eval_curve(y_t)
+        zs = eval_curve(z_t)
+        curve_points = {'x': xs.cpu().tolist(), 'y': ys.cpu().tolist(), 'z': zs.cpu().tolist()}
+
+        arrows = arrows_soa()
         if vector_field:
             Fx, Fy, Fz = vector_field
-            Fx_func = lambdify((x, y, z), Fx, modules=SCALAR_MODULES)
-            Fy_func = lambdify((x, y, z), Fy, modules=SCALAR_MODULES)
-            Fz_func = lambdify((x, y, z), Fz, modules=SCALAR_MODULES)
-
             arrow_step = max(1, num_points // 20)
-            arrow_indices = list(range(0, num_points, arrow_step))
-            for i in arrow_indices:
-                xi = curve_points['x'][i]
-                yi = curve_points['y'][i]
-                zi = curve_points['z'][i]
-                try:
-                    fx = float(Fx_func(xi, yi, zi))
-                    fy = float(Fy_func(xi, yi, zi))
-                    fz = float(Fz_func(xi, yi, zi))
-                    if all(math.isfinite(val) for val in [fx, fy, fz]):
-                        arrows.append({
-                            'origin': [xi, yi, zi],
-                            'direction': [fx, fy, fz],
-                        })
-                except Exception:
-                    pass
+            idx = torch.arange(0, num_points, arrow_step, device=_DEVICE)
+            ax, ay, az = xs[idx], ys[idx], zs[idx]
+            origins = torch.stack([ax, ay, az], dim=-1)
+            field = torch.stack(
+                [_eval_field(F_expr, ax, ay, az) for F_expr in (Fx, Fy, Fz)], dim=-1
+            )
+            mask = torch.isfinite(field).all(dim=-1)
+            arrows = arrows_soa(origins[mask], field[mask])
 
         return {
             'curve': curve_points,
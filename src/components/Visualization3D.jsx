@@ -109,27 +109,28 @@ export const Visualization3D = ({ data }) => {
       scene.add(new THREE.Line(lineGeom, new THREE.LineBasicMaterial({ color: 0x22d3ee, linewidth: 2 })));
     }
 
-    // Vector field arrows
+    // Vector field arrows (structure-of-arrays: one flat list per axis)
     const arrowData = data.arrows || data.field_arrows;
-    if (arrowData && arrowData.length > 0) {
-      arrowData.forEach(arr => {
-        const dir = new THREE.Vector3(arr.direction[0], arr.direction[2], arr.direction[1]);
+    if (arrowData && arrowData.origin_x && arrowData.origin_x.length > 0) {
+      for (let i = 0; i < arrowData.origin_x.length; i++) {
+        const dir = new THREE.Vector3(arrowData.dir_x[i], arrowData.dir_z[i], arrowData.dir_y[i]);
         const len = dir.length();
-        if (len < 0.001) return;
+        if (len < 0.001) continue;
         dir.normalize();
-        const origin = new THREE.Vector3(arr.origin[0], arr.origin[2], arr.origin[1]);
+        const origin = new THREE.Vector3(arrowData.origin_x[i], arrowData.origin_z[i], arrowData.origin_y[i]);
         const arrowLen = Math.min(0.3, len * 0.3);
         scene.add(new THREE.ArrowHelper(dir, origin, arrowLen, 0xf59e0b, arrowLen * 0.3, arrowLen * 0.15));
-      });
+      }
     }
 
     // Normal vectors
-    if (data.normals && data.normals.length > 0) {
-      data.normals.forEach(n => {
-        const dir = new THREE.Vector3(n.direction[0], n.direction[2], n.direction[1]).normalize();
-        const origin = new THREE.Vector3(n.origin[0], n.origin[2], n.origin[1]);
+    const nrm = data.normals;
+    if (nrm && nrm.origin_x && nrm.origin_x.length > 0) {
+      for (let i = 0; i < nrm.origin_x.length; i++) {
+        const dir = new THREE.Vector3(nrm.dir_x[i], nrm.dir_z[i], nrm.dir_y[i]).normalize();
+        const origin = new THREE.Vector3(nrm.origin_x[i], nrm.origin_z[i], nrm.origin_y[i]);
         scene.add(new THREE.ArrowHelper(dir, origin, 0.2, 0x10b981, 0.06, 0.03));
-      });
+      }
     }
 
     // Field lines
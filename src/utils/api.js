@@ -14,6 +14,35 @@ export function isDemoMode() {
   return isDemo;
 }
 
+// Rebuild nested arrays from a packed float32 bin blob ({dtype, shape, data}).
+// `lengths` trims ragged rows along the first axis (field lines).
+function unpackF32({ shape, data, lengths }) {
+  const floats = new Float32Array(data.slice().buffer);
+  const build = (dims, offset) => {
+    if (dims.length === 1) {
+      return Array.from(floats.subarray(offset, offset + dims[0]));
+    }
+    const stride = dims.slice(1).reduce((a, b) => a * b, 1);
+    return Array.from({ length: dims[0] }, (_, i) => build(dims.slice(1), offset + i * stride));
+  };
+  let result = shape.length ? build(shape, 0) : floats[0];
+  if (lengths) {
+    result = result.map((row, i) => row.slice(0, lengths[i]));
+  }
+  return result;
+}
+
+function decodeBinaryArrays(node) {
+  if (Array.isArray(node)) return node.map(decodeBinaryArrays);
+  if (node && typeof node === 'object' && !(node instanceof Uint8Array)) {
+    if (node.dtype === 'f32' && node.shape && node.data) return unpackF32(node);
+    const out = {};
+    for (const key of Object.keys(node)) out[key] = decodeBinaryArrays(node[key]);
+    return out;
+  }
+  return node;
+}
+
 async function realApiRequest(endpoint, body) {
   const encoded = encode(body);
   const response = await fetch(`${API_BASE}${endpoint}`, {
@@ -22,7 +51,7 @@ async function realApiRequest(endpoint, body) {
     body: encoded,
   });
   const buffer = await response.arrayBuffer();
-  const data = decode(new Uint8Array(buffer));
+  const data = decodeBinaryArrays(decode(new Uint8Array(buffer)));
   if (!data.success) {
     throw new Error(data.error || 'Computation failed');
   }
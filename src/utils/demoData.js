@@ -3,6 +3,18 @@
  * Each key maps to an API endpoint, values match the real response format.
  */
 
+// Arrows travel as a structure-of-arrays payload: one flat list per axis
+function arrowsSoA(arrows) {
+  return {
+    origin_x: arrows.map(a => a.origin[0]),
+    origin_y: arrows.map(a => a.origin[1]),
+    origin_z: arrows.map(a => a.origin[2]),
+    dir_x: arrows.map(a => a.direction[0]),
+    dir_y: arrows.map(a => a.direction[1]),
+    dir_z: arrows.map(a => a.direction[2]),
+  };
+}
+
 // ---- 1D: integral of x^2 from 0 to 1 ----
 const DEMO_1D = {
   success: true,
@@ -101,7 +113,7 @@ const DEMO_LINE_SCALAR = {
       y: Array.from({ length: 100 }, (_, i) => Math.sin(2 * Math.PI * i / 99)),
       z: Array.from({ length: 100 }, () => 0),
     },
-    arrows: [],
+    arrows: arrowsSoA([]),
     t_range: [0, 6.283185],
   },
 };
@@ -122,11 +134,11 @@ const DEMO_LINE_VECTOR = {
   },
   visualization: {
     curve: DEMO_LINE_SCALAR.visualization.curve,
-    arrows: Array.from({ length: 10 }, (_, i) => {
+    arrows: arrowsSoA(Array.from({ length: 10 }, (_, i) => {
       const t = 2 * Math.PI * i / 10;
       const cx = Math.cos(t), sy = Math.sin(t);
       return { origin: [cx, sy, 0], direction: [-sy, cx, 0] };
-    }),
+    })),
     t_range: [0, 6.283185],
   },
 };
@@ -158,8 +170,8 @@ const DEMO_SURFACE_SCALAR = {
   },
   visualization: {
     surface: makeHemisphere(),
-    normals: [{ origin: [0, 0, 1], direction: [0, 0, 1] }],
-    field_arrows: [],
+    normals: arrowsSoA([{ origin: [0, 0, 1], direction: [0, 0, 1] }]),
+    field_arrows: arrowsSoA([]),
     u_range: [0, Math.PI / 2],
     v_range: [0, 2 * Math.PI],
   },
@@ -182,8 +194,8 @@ const DEMO_FLUX = {
   },
   visualization: {
     surface: makeHemisphere(),
-    normals: [{ origin: [0, 0, 1], direction: [0, 0, 1] }],
-    field_arrows: [{ origin: [1, 0, 0], direction: [1, 0, 0] }],
+    normals: arrowsSoA([{ origin: [0, 0, 1], direction: [0, 0, 1] }]),
+    field_arrows: arrowsSoA([{ origin: [1, 0, 0], direction: [1, 0, 0] }]),
     u_range: [0, Math.PI / 2],
     v_range: [0, 2 * Math.PI],
   },
@@ -225,7 +237,7 @@ function makeVectorArrows() {
       }
     }
   }
-  return arrows;
+  return arrowsSoA(arrows);
 }
 
 const DEMO_VECTOR_FIELD = {
@@ -249,7 +261,7 @@ const DEMO_GREENS = {
   description: "oint(P dx + Q dy) = iint(dQ/dx - dP/dy) dA",
   visualization: {
     curve: DEMO_LINE_SCALAR.visualization.curve,
-    arrows: [],
+    arrows: arrowsSoA([]),
     t_range: [0, 6.283185],
   },
 };